@@ -0,0 +1,64 @@
+"""Loan affordability: EMI and the largest principal an income supports at a target DTI.
+
+All functions take scalars or NumPy arrays and broadcast, so one call covers a single applicant,
+a whole batch, or a grid of scenarios:
+
+    max_principal(1_200_000, 35, 12.0, 36)                       # one applicant
+    max_principal(incomes, 35, 12.0, tenures)                    # one value per applicant
+    affordability_grid(incomes, rates=[10, 12, 14], tenures=[36, 60], dtis=[30, 40])
+
+Amounts are in rupees, income is annual, interest is the nominal annual rate in percent and DTI
+is the share of monthly income available for the EMI, in percent.
+"""
+import numpy as np
+
+DEFAULT_INTEREST_PA = 12.0
+DEFAULT_DTI_PCT = 35.0
+
+
+def _annuity_factor(interest_pa, tenure_months) -> np.ndarray:
+    """Present value of 1 paid monthly for tenure_months months: (1 - (1 + r)^-n) / r, or n when r is 0."""
+    r = np.asarray(interest_pa, dtype=np.float64) / 100.0 / 12.0
+    n = np.maximum(np.asarray(tenure_months, dtype=np.float64), 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = (1 - np.power(1 + r, -n)) / r
+    return np.where(r > 0, factor, n)
+
+
+def max_emi(income, dti_pct=DEFAULT_DTI_PCT) -> np.ndarray:
+    """Largest monthly instalment for an annual income at a target DTI."""
+    return np.asarray(income, dtype=np.float64) / 12.0 * (np.asarray(dti_pct, dtype=np.float64) / 100.0)
+
+
+def max_principal(income, dti_pct=DEFAULT_DTI_PCT, interest_pa=DEFAULT_INTEREST_PA, tenure_months=36) -> np.ndarray:
+    """Largest loan whose EMI stays within dti_pct of monthly income."""
+    return max_emi(income, dti_pct) * _annuity_factor(interest_pa, tenure_months)
+
+
+def emi(principal, interest_pa=DEFAULT_INTEREST_PA, tenure_months=36) -> np.ndarray:
+    """Monthly instalment that repays principal over tenure_months."""
+    return np.asarray(principal, dtype=np.float64) / _annuity_factor(interest_pa, tenure_months)
+
+
+def affordability_columns(income, loan_amount, tenure_months, interest_pa=DEFAULT_INTEREST_PA,
+                          dti_pct=DEFAULT_DTI_PCT) -> dict:
+    """Per-applicant emi, max_affordable_loan and affordability_gap (max_affordable_loan - loan_amount)."""
+    limit = max_principal(income, dti_pct, interest_pa, tenure_months)
+    return {
+        'emi': emi(loan_amount, interest_pa, tenure_months),
+        'max_affordable_loan': limit,
+        'affordability_gap': limit - np.asarray(loan_amount, dtype=np.float64),
+    }
+
+
+def affordability_grid(income, rates, tenures, dtis) -> np.ndarray:
+    """Max principal for every applicant x rate x tenure x DTI combination.
+
+    Returns an array of shape (len(income), len(rates), len(tenures), len(dtis)); a scalar income
+    gives shape (len(rates), len(tenures), len(dtis)).
+    """
+    income = np.asarray(income, dtype=np.float64)[..., None, None, None]
+    rates = np.asarray(rates, dtype=np.float64)[:, None, None]
+    tenures = np.asarray(tenures, dtype=np.float64)[None, :, None]
+    dtis = np.asarray(dtis, dtype=np.float64)[None, None, :]
+    return max_emi(income, dtis) * _annuity_factor(rates, tenures)
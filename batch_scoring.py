@@ -0,0 +1,244 @@
+"""Streaming batch scoring for inputs that do not fit in memory.
+
+The input (CSV, or Parquet/Feather/Arrow with pyarrow installed) is read in fixed-size chunks,
+each chunk is scored with the vectorized predict_batch, and results are appended to the output
+file before the next chunk is read, so memory use depends on the chunk size rather than the
+file size.
+
+    from batch_scoring import score_csv
+    stats = score_csv('applicants.csv', 'scored.csv', chunk_size=100_000)
+
+With workers > 1, chunks are scored in a process pool. Each worker loads the model artifact
+once when it starts; tasks only carry the input shard, and results come back in input order.
+"""
+import collections
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from lite_inference import CATEGORICAL_INPUT_COLUMNS, RATING_CATEGORIES
+from prediction_helper import predict_batch, registry
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def _init_worker():
+    # Load the model artifact once per worker process, before the first task arrives
+    registry.get()
+
+
+def worker_pool(workers: int = None) -> ProcessPoolExecutor:
+    """Process pool whose workers hold their own copy of the model. workers defaults to the CPU count."""
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker)
+
+
+def _map_ordered(pool, fn, items, max_pending):
+    """Like pool.map, but consumes items lazily with at most max_pending tasks in flight."""
+    pending = collections.deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def predict_batch_parallel(raw_df: pd.DataFrame, workers: int = None, shard_size: int = DEFAULT_CHUNK_SIZE,
+                           explain: bool = False, top_k: int = 3, affordability: bool = False) -> pd.DataFrame:
+    """predict_batch split into shards of shard_size rows and scored across worker processes.
+    Output is identical to predict_batch(raw_df, explain, top_k, affordability).
+    """
+    score = functools.partial(predict_batch, explain=explain, top_k=top_k, affordability=affordability)
+    if len(raw_df) <= shard_size or workers == 1:
+        return score(raw_df)
+    shards = (raw_df.iloc[start:start + shard_size] for start in range(0, len(raw_df), shard_size))
+    with worker_pool(workers) as pool:
+        return concat_scored(pool.map(score, shards))
+
+
+def concat_scored(frames) -> pd.DataFrame:
+    """pd.concat of predict_batch outputs that keeps the Categorical columns categorical.
+    Each shard's input categories include its own unknown values, and pd.concat turns columns
+    with differing categories into strings, so they are first set to the union in shard order.
+    """
+    frames = list(frames)
+    for col in frames[0].columns:
+        if all(isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames):
+            levels = list(dict.fromkeys(level for frame in frames for level in frame[col].cat.categories))
+            frames = [frame.assign(**{col: frame[col].cat.set_categories(levels)}) for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+FORMATS = ('csv', 'parquet', 'feather', 'arrow')
+_EXTENSIONS = {'.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet', '.feather': 'feather',
+               '.arrow': 'arrow', '.ipc': 'arrow'}
+
+
+def format_from_path(path, default: str = 'csv') -> str:
+    """Infer one of FORMATS from a file extension; file-like objects get the default."""
+    if not isinstance(path, (str, os.PathLike)):
+        return default
+    ext = os.path.splitext(os.fspath(path))[1].lower()
+    return _EXTENSIONS.get(ext, default)
+
+
+def _check_format(fmt: str):
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported format {fmt!r}; expected one of {FORMATS}")
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Parquet/Feather/Arrow support requires pyarrow: pip install pyarrow") from e
+    return pa
+
+
+def typed_results(scored: pd.DataFrame) -> pd.DataFrame:
+    """Compact dtypes for columnar outputs: float32 probability, int16 score, categorical rating."""
+    return scored.astype({
+        'default_probability': np.float32,
+        'credit_score': np.int16,
+        'rating': pd.CategoricalDtype(RATING_CATEGORIES),
+    })
+
+
+def read_input_chunks(source, chunk_size: int = DEFAULT_CHUNK_SIZE, fmt: str = 'csv'):
+    """Yield DataFrames of at most chunk_size raw input rows from a CSV, Parquet, Feather or Arrow source."""
+    _check_format(fmt)
+    if fmt == 'csv':
+        yield from pd.read_csv(source, chunksize=chunk_size)
+        return
+    pa = _pyarrow()
+    if fmt == 'parquet':
+        batches = pa.parquet.ParquetFile(source).iter_batches(batch_size=chunk_size)
+    else:
+        reader = pa.ipc.open_file(source)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    for batch in batches:
+        for start in range(0, batch.num_rows, chunk_size):
+            yield batch.slice(start, chunk_size).to_pandas()
+
+
+def iter_scored_chunks(source, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1,
+                       explain: bool = False, top_k: int = 3, input_format: str = 'csv', affordability: bool = False,
+                       rejects=None):
+    """Yield a scored DataFrame for each chunk of a path or file-like object, in input order.
+    With a validation.RejectLog as rejects, invalid rows are written there instead of being scored.
+    """
+    score = functools.partial(predict_batch, explain=explain, top_k=top_k, affordability=affordability)
+    chunks = read_input_chunks(source, chunk_size, input_format)
+    if rejects is not None:
+        chunks = rejects.filter(chunks)
+    if workers == 1:
+        for chunk in chunks:
+            yield score(chunk)
+        return
+    workers = workers or os.cpu_count()
+    with worker_pool(workers) as pool:
+        # Bound the read-ahead so memory stays proportional to chunk_size * workers
+        yield from _map_ordered(pool, score, chunks, max_pending=2 * workers)
+
+
+def write_scored_chunks(chunks, destination, fmt: str = 'csv') -> dict:
+    """Append scored chunks to a path or file-like object, writing the header/schema once.
+
+    Columnar formats (parquet, feather, arrow) store typed_results dtypes; feather is an
+    LZ4-compressed Arrow IPC file, arrow an uncompressed one.
+    """
+    _check_format(fmt)
+    if fmt != 'csv':
+        return _write_columnar(chunks, destination, fmt)
+    if hasattr(destination, 'write'):
+        return _write_csv(chunks, destination)
+    with open(destination, 'w', newline='') as out:
+        return _write_csv(chunks, out)
+
+
+def _write_csv(chunks, out) -> dict:
+    rows = 0
+    n_chunks = 0
+    for scored in chunks:
+        scored.to_csv(out, header=n_chunks == 0, index=False)
+        rows += len(scored)
+        n_chunks += 1
+    return {'rows': rows, 'chunks': n_chunks}
+
+
+def _open_columnar_writer(pa, destination, schema, fmt: str):
+    if fmt == 'parquet':
+        return pa.parquet.ParquetWriter(destination, schema)
+    options = pa.ipc.IpcWriteOptions(compression='lz4' if fmt == 'feather' else None)
+    return pa.ipc.new_file(destination, schema, options=options)
+
+
+def _write_columnar(chunks, destination, fmt: str) -> dict:
+    pa = _pyarrow()
+    rows = 0
+    n_chunks = 0
+    writer = None
+    empty = None
+    try:
+        for scored in chunks:
+            n_chunks += 1
+            if scored.empty:
+                # An empty chunk (e.g. every row rejected) has untyped columns; take the schema from real rows
+                empty = scored
+                continue
+            scored = typed_results(scored)
+            if writer is None:
+                schema = pa.Schema.from_pandas(scored, preserve_index=False)
+                # Input categories can differ between chunks and an Arrow file allows one dictionary
+                # per column, so they are written as plain strings
+                for i, field in enumerate(schema):
+                    if field.name in CATEGORICAL_INPUT_COLUMNS and pa.types.is_dictionary(field.type):
+                        schema = schema.set(i, field.with_type(field.type.value_type))
+                writer = _open_columnar_writer(pa, destination, schema, fmt)
+            # Every chunk is cast to the first chunk's schema so row groups/batches match
+            writer.write_table(pa.Table.from_pandas(scored, schema=schema, preserve_index=False))
+            rows += len(scored)
+        if writer is None and empty is not None:
+            # No rows at all: still write a file with the output columns
+            table = pa.Table.from_pandas(empty, preserve_index=False)
+            writer = _open_columnar_writer(pa, destination, table.schema, fmt)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return {'rows': rows, 'chunks': n_chunks}
+
+
+def score_file(source, destination, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1,
+               explain: bool = False, top_k: int = 3, input_format: str = None, output_format: str = None,
+               affordability: bool = False, summary=None, rejects=None) -> dict:
+    """Score raw applicant inputs from source into destination, one chunk at a time.
+
+    Formats (one of FORMATS) default to the file extensions. source/destination may be paths or
+    file-like objects; workers=None uses every CPU. explain/top_k add per-row reason codes and
+    affordability adds EMI/max-loan columns (see predict_batch). A portfolio.PortfolioSummary passed
+    as summary is updated with every chunk as it is written. A validation.RejectLog passed as
+    rejects validates every chunk first and receives the invalid rows (see validate_inputs).
+    Returns {'rows': ..., 'chunks': ...}, plus 'rejected' with rejects.
+    """
+    input_format = input_format or format_from_path(source)
+    output_format = output_format or format_from_path(destination)
+    chunks = iter_scored_chunks(source, chunk_size, workers, explain, top_k, input_format, affordability, rejects)
+    if summary is not None:
+        chunks = summary.track(chunks)
+    stats = write_scored_chunks(chunks, destination, output_format)
+    if rejects is not None:
+        stats['rejected'] = rejects.rejected
+    return stats
+
+
+def score_csv(source, destination, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1,
+              explain: bool = False, top_k: int = 3) -> dict:
+    """Score a CSV of raw applicant inputs into an output CSV, one chunk at a time (see score_file)."""
+    return score_file(source, destination, chunk_size, workers, explain, top_k,
+                      input_format='csv', output_format='csv')
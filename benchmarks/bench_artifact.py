@@ -0,0 +1,86 @@
+"""Compare loading the joblib artifact with the compact memory-mapped one.
+
+For each format, --processes interpreters load the model at the same time (as batch workers do).
+Each reports its load time and the RSS the load added; while all of them are alive, their
+/proc/<pid>/smaps_rollup gives PSS (shared pages split between the processes that map them) and
+private memory. Memory figures need Linux. Run from the repository root:
+    python -m benchmarks.bench_artifact --processes 4
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from model_artifact import COMPACT_MODEL_PATH
+from prediction_helper import MODEL_PATH
+
+PROBE = r'''
+import json, sys, time
+import prediction_helper
+
+def rss_kb():
+    try:
+        with open('/proc/self/status') as f:
+            return next(int(line.split()[1]) for line in f if line.startswith('VmRSS:'))
+    except OSError:
+        return 0
+
+before = rss_kb()
+t0 = time.perf_counter()
+prediction_helper.registry.get()
+t1 = time.perf_counter()
+print(json.dumps({'load_ms': (t1 - t0) * 1e3, 'load_rss_mb': (rss_kb() - before) / 1024}), flush=True)
+sys.stdin.read()  # stay alive until the parent has read our memory maps
+'''
+
+
+def _smaps_rollup_mb(pid: int) -> dict:
+    fields = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                if rest.strip().endswith('kB'):
+                    fields[name] = int(rest.split()[0]) / 1024
+    except OSError:
+        return {}
+    return {'rss_mb': fields.get('Rss', 0.0), 'pss_mb': fields.get('Pss', 0.0),
+            'private_mb': fields.get('Private_Clean', 0.0) + fields.get('Private_Dirty', 0.0)}
+
+
+def measure(path: str, processes: int) -> list:
+    env = dict(os.environ, SAFELEND_MODEL=path)
+    procs = [subprocess.Popen([sys.executable, '-W', 'ignore', '-c', PROBE], env=env, text=True,
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE) for _ in range(processes)]
+    try:
+        results = [json.loads(p.stdout.readline()) for p in procs]
+        for p, result in zip(procs, results):
+            result.update(_smaps_rollup_mb(p.pid))
+    finally:
+        for p in procs:
+            p.communicate()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--joblib', default=MODEL_PATH)
+    parser.add_argument('--compact', default=COMPACT_MODEL_PATH)
+    args = parser.parse_args()
+
+    for label, path in [('joblib', args.joblib), ('compact (mmap)', args.compact)]:
+        results = measure(path, args.processes)
+        print(f"{label:15s} {os.path.getsize(path):>7,} bytes on disk, {args.processes} processes")
+        for key, unit in [('load_ms', 'model load (ms)'), ('load_rss_mb', 'RSS added by load (MB)'),
+                          ('rss_mb', 'RSS per process (MB)'), ('pss_mb', 'PSS per process (MB)'),
+                          ('private_mb', 'private per process (MB)')]:
+            values = [r[key] for r in results if key in r]
+            if values:
+                print(f"  {unit:28s} median {statistics.median(values):8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Compare vectorized predict_batch against the row-by-row loop, and report its memory per 1M rows.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch --rows 5000 --memory-rows 1000000
+
+Memory is measured with tracemalloc on a separate --memory-rows batch (0 skips it): the peak
+allocated while predict_batch runs, on top of its input frame, and the size of the frame it
+returns, both scaled to one million rows.
+"""
+import argparse
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import make_applicants
+from prediction_helper import predict_batch, predict_batch_rowwise, registry
+
+
+def frame_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def batch_memory(rows: int, seed: int = 0) -> dict:
+    """MB per 1M rows: the input frame, predict_batch's traced peak and its result frame."""
+    df = make_applicants(rows, seed=seed)
+    registry.get()  # keep the model load out of the measurement
+    tracemalloc.start()
+    try:
+        result = predict_batch(df)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    per_million = 1e6 / rows
+    return {
+        'input_mb': frame_mb(df) * per_million,
+        'peak_mb': peak / 1e6 * per_million,
+        'result_mb': frame_mb(result) * per_million,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5_000)
+    parser.add_argument('--memory-rows', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    df = make_applicants(args.rows, seed=args.seed)
+
+    start = time.perf_counter()
+    expected = predict_batch_rowwise(df)
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = predict_batch(df)
+    vec_s = time.perf_counter() - start
+
+    # predict_batch returns Categoricals where the loop has strings; the values must match exactly
+    categorical = [col for col in actual.columns if isinstance(actual[col].dtype, pd.CategoricalDtype)]
+    pd.testing.assert_frame_equal(actual.astype({col: object for col in categorical}), expected,
+                                  check_dtype=False, check_exact=True)
+
+    # A blank whole-number cell must fail in both paths, not score as a huge negative age
+    blank = df.head(10).copy()
+    blank.loc[3, 'age'] = float('nan')
+    for score in (predict_batch_rowwise, predict_batch):
+        try:
+            score(blank)
+        except ValueError:
+            continue
+        raise AssertionError(f"{score.__name__} scored a NaN age instead of raising ValueError")
+
+    print(f"rows:          {args.rows:,}")
+    print(f"iterrows loop: {loop_s:8.3f} s  ({args.rows / loop_s:,.0f} rows/s)")
+    print(f"vectorized:    {vec_s:8.3f} s  ({args.rows / vec_s:,.0f} rows/s)")
+    print(f"speedup:       {loop_s / vec_s:8.1f}x  (outputs identical)")
+
+    if args.memory_rows > 0:
+        memory = batch_memory(args.memory_rows, seed=args.seed)
+        print(f"memory per 1M rows (measured on {args.memory_rows:,}):")
+        print(f"  input frame:        {memory['input_mb']:8.1f} MB")
+        print(f"  predict_batch peak: {memory['peak_mb']:8.1f} MB")
+        print(f"  result frame:       {memory['result_mb']:8.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
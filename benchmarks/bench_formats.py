@@ -0,0 +1,47 @@
+"""Compare serialization time and file size of batch results across output formats.
+
+CSV is the current Batch tab path; Parquet, Feather and Arrow store typed columns
+(float32 probability, int16 score, categorical rating). Run from the repository root:
+    python -m benchmarks.bench_formats --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from batch_scoring import FORMATS, read_input_chunks, write_scored_chunks
+from benchmarks.synthetic import make_applicants
+from prediction_helper import predict_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    args = parser.parse_args()
+
+    scored = predict_batch(make_applicants(args.rows))
+    chunks = [scored.iloc[i:i + args.chunk_size] for i in range(0, len(scored), args.chunk_size)]
+    print(f"rows: {args.rows:,}  chunk size: {args.chunk_size:,}")
+    print(f"{'format':>8} {'write s':>8} {'read s':>8} {'size MB':>9} {'vs csv':>7}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_size = None
+        for fmt in FORMATS:
+            path = os.path.join(tmp_dir, f"results.{fmt}")
+            start = time.perf_counter()
+            write_scored_chunks(chunks, path, fmt)
+            write_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in read_input_chunks(path, args.chunk_size, fmt):
+                pass
+            read_s = time.perf_counter() - start
+
+            size = os.path.getsize(path)
+            csv_size = csv_size or size
+            print(f"{fmt:>8} {write_s:>8.2f} {read_s:>8.2f} {size / 1e6:>9.1f} {size / csv_size:>6.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Compare cold-start cost of the full scoring stack with the NumPy-only lite_inference module.
+
+Each run is a fresh interpreter started with `-X importtime`; the cumulative import time of the
+top-level module is read from its report. A second probe times import + model load + the first
+score end to end. Run from the repository root:
+    python -m benchmarks.bench_importtime --repeat 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+PATHS = {
+    'prediction_helper': (
+        'prediction_helper',
+        "import prediction_helper as m; m.predict(*ARGS)",
+    ),
+    'lite_inference': (
+        'lite_inference',
+        "import lite_inference as m; m.LiteScorer.load().predict(*ARGS)",
+    ),
+}
+
+PROBE = r'''
+import json, sys, time
+t0 = time.perf_counter()
+ARGS = (28, 1200000, 900000, 36, 20, 30, 30, 2, 'Owned', 'Personal', 'Unsecured')
+{code}
+t1 = time.perf_counter()
+heavy = [name for name in ('pandas', 'sklearn', 'scipy', 'joblib') if name in sys.modules]
+print(json.dumps({{'first_score_ms': (t1 - t0) * 1e3, 'heavy_modules': heavy}}))
+'''
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of module as reported by -X importtime."""
+    stderr = subprocess.run([sys.executable, '-W', 'ignore', '-X', 'importtime', '-c', f'import {module}'],
+                            check=True, capture_output=True, text=True).stderr
+    for line in stderr.splitlines():
+        fields = [f.strip() for f in line.split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1e3
+    raise RuntimeError(f"no -X importtime entry for {module}")
+
+
+def first_score(code: str) -> dict:
+    out = subprocess.run([sys.executable, '-W', 'ignore', '-c', PROBE.format(code=code)],
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for label, (module, code) in PATHS.items():
+        imports = [import_time_ms(module) for _ in range(args.repeat)]
+        runs = [first_score(code) for _ in range(args.repeat)]
+        print(f"{label:18s} import {statistics.median(imports):8.1f} ms   "
+              f"import + load + first score {statistics.median(r['first_score_ms'] for r in runs):8.1f} ms   "
+              f"heavy modules loaded: {', '.join(runs[0]['heavy_modules']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Measure how batch scoring throughput scales with the number of worker processes.
+
+Run from the repository root:
+    python -m benchmarks.bench_parallel --rows 2000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import time
+
+from batch_scoring import predict_batch_parallel
+from benchmarks.synthetic import make_applicants
+from prediction_helper import registry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--shard-size', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    df = make_applicants(args.rows)
+    # Load the model before timing: otherwise the first run pays for it, and forked workers inherit it
+    registry.get()
+    print(f"rows: {args.rows:,}  shard size: {args.shard_size:,}  cpus: {os.cpu_count()}")
+    print(f"{'workers':>7} {'seconds':>9} {'rows/s':>12} {'speedup':>8} {'efficiency':>10}")
+
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        predict_batch_parallel(df, workers=workers, shard_size=args.shard_size)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        print(f"{workers:>7} {elapsed:>9.2f} {args.rows / elapsed:>12,.0f} {speedup:>7.2f}x "
+              f"{speedup / workers * args.workers[0]:>9.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""Microbenchmark the single-applicant scoring kernel against the DataFrame path.
+
+Run from the repository root:
+    python -m benchmarks.bench_predict --calls 20000
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import make_applicants
+from prediction_helper import RAW_INPUT_COLUMNS, calculate_credit_score, prepare_input, scorer
+
+
+def dataframe_path(*args):
+    return calculate_credit_score(prepare_input(*args))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=20_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rows = list(make_applicants(args.calls, seed=args.seed)[RAW_INPUT_COLUMNS].itertuples(index=False))
+
+    results = {}
+    for name, fn in [('prepare_input + calculate_credit_score', dataframe_path),
+                     ('LinearScorer.score', scorer.score)]:
+        start = time.perf_counter()
+        results[name] = [fn(*row) for row in rows]
+        elapsed = time.perf_counter() - start
+        print(f"{name:40s} {elapsed / args.calls * 1e6:8.1f} us/call")
+
+    expected, actual = results.values()
+    mismatches = sum(a != e for a, e in zip(actual, expected))
+    print(f"bit-for-bit mismatches: {mismatches} / {args.calls:,}")
+
+
+if __name__ == '__main__':
+    main()
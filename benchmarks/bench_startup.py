@@ -0,0 +1,46 @@
+"""Measure cold-start cost: module import, first prediction (model load) and warm predictions.
+
+Each measurement runs in a fresh interpreter. Run from the repository root:
+    python -m benchmarks.bench_startup --repeat 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+PROBE = r'''
+import json, time
+t0 = time.perf_counter()
+import prediction_helper
+t1 = time.perf_counter()
+args = (28, 1200000, 900000, 36, 20, 30, 30, 2, 'Owned', 'Personal', 'Unsecured')
+prediction_helper.predict(*args)
+t2 = time.perf_counter()
+for _ in range(1000):
+    prediction_helper.registry.get()
+t3 = time.perf_counter()
+prediction_helper.predict(*args)
+t4 = time.perf_counter()
+print(json.dumps({'import_ms': (t1 - t0) * 1e3, 'first_predict_ms': (t2 - t1) * 1e3,
+                  'registry_get_us': (t3 - t2) * 1e3, 'warm_predict_us': (t4 - t3) * 1e6}))
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [json.loads(subprocess.run([sys.executable, '-W', 'ignore', '-c', PROBE], check=True,
+                                      capture_output=True, text=True).stdout)
+            for _ in range(args.repeat)]
+    for key, label in [('import_ms', 'import prediction_helper (ms)'),
+                       ('first_predict_ms', 'first predict incl. model load (ms)'),
+                       ('registry_get_us', 'registry.get() when loaded (us)'),
+                       ('warm_predict_us', 'warm predict (us)')]:
+        print(f"{label:38s} median {statistics.median(r[key] for r in runs):8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Load generator for scoring_service.py.
+
+Opens --concurrency keep-alive connections that POST /score back to back for --duration
+seconds, then prints client-side latency percentiles and throughput next to the service's
+own /metrics. Start the service first:
+    python scoring_service.py --port 8000
+    python -m benchmarks.load_service --port 8000 --concurrency 64 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_applicants
+
+
+async def request(reader, writer, method: str, path: str, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(host, port, applicants, stop_at, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = 0
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        status, _ = await request(reader, writer, 'POST', '/score', applicants[i % len(applicants)])
+        latencies.append(time.perf_counter() - start)
+        errors[0] += status != 200
+        i += 1
+    writer.close()
+
+
+async def run(args):
+    applicants = make_applicants(10_000).to_dict('records')
+    applicants = [{k: v.item() if hasattr(v, 'item') else v for k, v in a.items()} for a in applicants]
+    latencies, errors = [], [0]
+    start = time.perf_counter()
+    stop_at = start + args.duration
+    await asyncio.gather(*(client(args.host, args.port, applicants[i::args.concurrency], stop_at, latencies, errors)
+                           for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    ms = np.asarray(latencies) * 1e3
+    print(f"requests: {len(ms):,}  errors: {errors[0]}  concurrency: {args.concurrency}")
+    print(f"client throughput: {len(ms) / elapsed:,.0f} req/s")
+    print(f"client latency ms: p50 {np.percentile(ms, 50):.2f}  p99 {np.percentile(ms, 99):.2f}  max {ms.max():.2f}")
+
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    _, metrics = await request(reader, writer, 'GET', '/metrics')
+    writer.close()
+    print("service /metrics:", json.dumps(metrics, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for scoring_service.py")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
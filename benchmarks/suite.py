@@ -0,0 +1,203 @@
+"""Benchmark suite for every scoring path in prediction_helper.
+
+Runs predict, prepare_input, calculate_credit_score, explain_from_inputs and predict_batch on
+synthetic applicants at several sizes, and reports latency percentiles, rows/sec and peak
+traced memory. Results are written as JSON; compare mode flags slowdowns against a baseline.
+
+Run from the repository root:
+    python -m benchmarks.suite run --output bench_results.json
+    python -m benchmarks.suite run --sizes 1 1000 --output current.json --baseline bench_results.json
+    python -m benchmarks.suite compare bench_results.json current.json --threshold 0.10
+
+Per-applicant functions are called once per row on at most --max-calls rows of each size
+(the 'calls' field records how many), so the 1M-row case stays tractable.
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import prediction_helper
+from benchmarks.synthetic import make_applicants
+
+DEFAULT_SIZES = (1, 1_000, 100_000, 1_000_000)
+
+
+def _per_row_args(df: pd.DataFrame, limit: int) -> list:
+    return list(df[prediction_helper.RAW_INPUT_COLUMNS].head(limit).itertuples(index=False, name=None))
+
+
+def _per_call_case(fn, arg_rows: list):
+    """A case that calls fn once per element of arg_rows, one row per call."""
+    def run():
+        for args in arg_rows:
+            fn(*args)
+    return run, [lambda args=args: fn(*args) for args in arg_rows], 1
+
+
+def case_predict(df, max_calls):
+    return _per_call_case(prediction_helper.predict, _per_row_args(df, max_calls))
+
+
+def case_prepare_input(df, max_calls):
+    return _per_call_case(prediction_helper.prepare_input, _per_row_args(df, max_calls))
+
+
+def case_calculate_credit_score(df, max_calls):
+    prepared = [(prediction_helper.prepare_input(*args),) for args in _per_row_args(df, max_calls)]
+    return _per_call_case(prediction_helper.calculate_credit_score, prepared)
+
+
+def case_explain_from_inputs(df, max_calls):
+    return _per_call_case(prediction_helper.explain_from_inputs, _per_row_args(df, max_calls))
+
+
+def case_predict_batch(df, max_calls):
+    def run():
+        prediction_helper.predict_batch(df)
+    return run, [run], len(df)
+
+
+CASES = {
+    'predict': case_predict,
+    'prepare_input': case_prepare_input,
+    'calculate_credit_score': case_calculate_credit_score,
+    'explain_from_inputs': case_explain_from_inputs,
+    'predict_batch': case_predict_batch,
+}
+
+BATCH_CASES = {'predict_batch'}
+
+
+def _timed_calls(calls: list, repeat: int) -> np.ndarray:
+    """Latency in seconds of each call; a single batch call is repeated to get a distribution."""
+    rounds = repeat if len(calls) == 1 else 1
+    latencies = []
+    for _ in range(rounds):
+        for call in calls:
+            prediction_helper.score_cache.clear()  # measure the uncached path
+            start = time.perf_counter()
+            call()
+            latencies.append(time.perf_counter() - start)
+    return np.asarray(latencies)
+
+
+def _peak_traced_mb(run) -> float:
+    prediction_helper.score_cache.clear()
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(name: str, rows: int, max_calls: int, repeat: int) -> dict:
+    # Per-applicant cases only ever look at the first max_calls rows
+    df = make_applicants(rows if name in BATCH_CASES else min(rows, max_calls))
+    run, calls, rows_per_call = CASES[name](df, max_calls)
+    latencies = _timed_calls(calls, repeat)
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1e3
+    return {
+        'name': name,
+        'rows': rows,
+        'calls': len(latencies),
+        'p50_ms': round(float(p50), 4),
+        'p90_ms': round(float(p90), 4),
+        'p99_ms': round(float(p99), 4),
+        'rows_per_s': round(rows_per_call / float(np.median(latencies)), 1),
+        'peak_mb': round(_peak_traced_mb(run), 2),
+    }
+
+
+def run_suite(names, sizes, max_calls: int, repeat: int, log=print) -> dict:
+    prediction_helper.registry.get()  # keep the model load out of the measurements
+    results = []
+    for name in names:
+        for rows in sizes:
+            result = run_case(name, rows, max_calls, repeat)
+            log(f"{name:24s} rows={rows:>9,} calls={result['calls']:>5} p50={result['p50_ms']:>10.3f} ms "
+                f"p99={result['p99_ms']:>10.3f} ms {result['rows_per_s']:>12,.0f} rows/s peak={result['peak_mb']:>8.1f} MB")
+            results.append(result)
+    return {
+        'meta': {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'max_calls': max_calls,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """Return (name, rows, baseline p50, current p50, change) for cases slower than threshold."""
+    base = {(r['name'], r['rows']): r for r in baseline['results']}
+    regressions = []
+    for r in current['results']:
+        b = base.get((r['name'], r['rows']))
+        if b is None or not b['p50_ms']:
+            continue
+        change = r['p50_ms'] / b['p50_ms'] - 1
+        if change > threshold:
+            regressions.append((r['name'], r['rows'], b['p50_ms'], r['p50_ms'], change))
+    return regressions
+
+
+def report_regressions(regressions: list, threshold: float) -> int:
+    if not regressions:
+        print(f"no slowdowns beyond {threshold:.0%}")
+        return 0
+    print(f"{len(regressions)} case(s) slower than baseline by more than {threshold:.0%}:")
+    for name, rows, before, after, change in regressions:
+        print(f"  SLOWER {name:24s} rows={rows:>9,} p50 {before:.3f} -> {after:.3f} ms ({change:+.0%})")
+    return 1
+
+
+def _load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_p = sub.add_parser('run', help="run the suite and write JSON results")
+    run_p.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    run_p.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES))
+    run_p.add_argument('--max-calls', type=int, default=1_000, help="cap on per-applicant calls per size")
+    run_p.add_argument('--repeat', type=int, default=5, help="repetitions of each batch call")
+    run_p.add_argument('--output', default='bench_results.json')
+    run_p.add_argument('--baseline', help="results file to compare against after the run")
+    run_p.add_argument('--threshold', type=float, default=0.10, help="relative p50 slowdown to flag")
+
+    cmp_p = sub.add_parser('compare', help="compare two results files")
+    cmp_p.add_argument('baseline')
+    cmp_p.add_argument('current')
+    cmp_p.add_argument('--threshold', type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        return report_regressions(compare(_load(args.baseline), _load(args.current), args.threshold), args.threshold)
+
+    results = run_suite(args.cases, args.sizes, args.max_calls, args.repeat)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"wrote {args.output}")
+    if args.baseline:
+        return report_regressions(compare(_load(args.baseline), results, args.threshold), args.threshold)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+
+def make_applicants(n: int, seed: int = 0) -> pd.DataFrame:
+    """Return n synthetic applicants with the raw input columns used by the batch scorer."""
+    rng = np.random.default_rng(seed)
+    income = rng.integers(200_000, 5_000_000, n).astype(float)
+    return pd.DataFrame({
+        'age': rng.integers(18, 70, n),
+        'income': income,
+        'loan_amount': np.round(income * rng.uniform(0.1, 4.0, n), -3),
+        'loan_tenure_months': rng.choice([6, 12, 24, 36, 48, 60, 84, 120], n),
+        'avg_dpd_per_delinquency': rng.integers(0, 60, n).astype(float),
+        'delinquency_ratio': rng.integers(0, 100, n).astype(float),
+        'credit_utilization_ratio': rng.integers(0, 100, n).astype(float),
+        'num_open_accounts': rng.integers(1, 5, n),
+        'residence_type': rng.choice(['Owned', 'Rented', 'Mortgage'], n),
+        'loan_purpose': rng.choice(['Education', 'Home', 'Auto', 'Personal'], n),
+        'loan_type': rng.choice(['Secured', 'Unsecured'], n),
+    })
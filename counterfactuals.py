@@ -0,0 +1,182 @@
+"""Counterfactuals: the smallest change to one input that lifts an applicant into a better rating band.
+
+The model is linear in its scaled features, so for most inputs the required value follows in
+closed form from the gap between the applicant's logit and the logit of the target score:
+
+    credit_score >= T  <=>  default_probability <= 1 - (T - 300) / 600  <=>  logit <= z_T
+
+Income enters through loan_to_income (loan_amount / income), which is solved the same way on
+loan_to_income and then inverted. Each required value is rounded to the input's step in the
+improving direction, then rescored with the real model; rows that still miss the target are
+nudged one more step. Everything is vectorized across rows, so a whole batch is handled at once.
+
+    from counterfactuals import minimal_changes
+    changes = minimal_changes(applicants_df, target='Good')
+"""
+import numpy as np
+import pandas as pd
+
+from prediction_helper import calculate_credit_scores, coerce_batch_inputs, prepare_batch_input, registry
+
+# Lowest credit_score of each band an applicant can be moved into
+TARGET_BANDS = {'Average': 500, 'Good': 650, 'Excellent': 750}
+
+# Inputs an applicant can change: label, model feature, (lowest, highest) allowed value, rounding step
+ACTIONABLE_INPUTS = {
+    'credit_utilization_ratio': ('Credit Utilization (%)', 'credit_utilization_ratio', (0, 100), 1),
+    'loan_amount': ('Loan Amount (₹)', 'loan_to_income', (0, np.inf), 1000),
+    'income': ('Annual Income (₹)', 'loan_to_income', (1, np.inf), 1000),
+    'loan_tenure_months': ('Loan Tenure (months)', 'loan_tenure_months', (1, 360), 1),
+    'num_open_accounts': ('Open Accounts', 'number_of_open_accounts', (1, 10), 1),
+    'delinquency_ratio': ('Delinquency Ratio (%)', 'delinquency_ratio', (0, 100), 1),
+    'avg_dpd_per_delinquency': ('Avg DPD', 'avg_dpd_per_delinquency', (0, np.inf), 1),
+}
+
+MAX_NUDGES = 3
+
+
+def target_logit(target_score: float, base_score=300, scale_length=600) -> float:
+    """Largest logit whose credit score still reaches target_score."""
+    p = 1 - (target_score - base_score) / scale_length
+    return float(np.log(p / (1 - p)))
+
+
+def _logits(input_df: pd.DataFrame, bundle) -> np.ndarray:
+    model = bundle.model
+    values = np.ascontiguousarray(input_df.to_numpy(dtype=np.float64))
+    return (np.matmul(values[:, np.newaxis, :], model.coef_.T)[:, 0, :] + model.intercept_)[:, 0]
+
+
+def _feature_gradient(feature: str, bundle) -> float:
+    """d(logit) / d(unscaled feature value)."""
+    coef = bundle.model.coef_[0][list(bundle.features).index(feature)]
+    cols = list(bundle.cols_to_scale)
+    return coef * (bundle.scaler.scale_[cols.index(feature)] if feature in cols else 1.0)
+
+
+def _scaled(feature: str, values: np.ndarray, bundle) -> np.ndarray:
+    """Scale one unscaled feature column the way scaler.transform does."""
+    cols = list(bundle.cols_to_scale)
+    if feature not in cols:
+        return values
+    i = cols.index(feature)
+    scaled = values * bundle.scaler.scale_[i] + bundle.scaler.min_[i]
+    if getattr(bundle.scaler, 'clip', False):
+        scaled = np.clip(scaled, *bundle.scaler.feature_range)
+    return scaled
+
+
+def _loan_to_income(loan_amount: np.ndarray, income: np.ndarray) -> np.ndarray:
+    out = np.zeros(len(income))
+    np.divide(loan_amount, income, out=out, where=income > 0)
+    return out
+
+
+def _feature_values(name: str, inputs: pd.DataFrame, values: np.ndarray) -> np.ndarray:
+    """Unscaled model feature for input name set to values, other inputs unchanged."""
+    if name == 'loan_amount':
+        return _loan_to_income(values, inputs['income'].to_numpy())
+    if name == 'income':
+        return _loan_to_income(inputs['loan_amount'].to_numpy(), values)
+    return values
+
+
+def _round_towards(values: np.ndarray, step: float, up: np.ndarray) -> np.ndarray:
+    return np.where(up, np.ceil(values / step), np.floor(values / step)) * step
+
+
+def _closed_form(name: str, inputs: pd.DataFrame, gap: np.ndarray, bundle) -> tuple:
+    """Unrounded required values for input name, and whether the improvement is an increase."""
+    _, feature, _, _ = ACTIONABLE_INPUTS[name]
+    grad = _feature_gradient(feature, bundle)
+    current = inputs[name].to_numpy(dtype=np.float64)
+    income = inputs['income'].to_numpy(dtype=np.float64)
+    loan_amount = inputs['loan_amount'].to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if name == 'loan_amount':
+            # loan_to_income moves by 1/income per rupee; it is 0 (and fixed) when income is 0
+            per_unit = np.where(income > 0, grad / income, 0.0)
+            required = current - gap / per_unit
+            increase = np.broadcast_to(per_unit < 0, current.shape)
+        elif name == 'income':
+            lti_required = _loan_to_income(loan_amount, income) - gap / grad
+            required = np.where(lti_required > 0, loan_amount / lti_required, np.inf)
+            increase = np.broadcast_to(grad > 0, current.shape)
+        else:
+            required = current - gap / grad
+            increase = np.broadcast_to(grad < 0, current.shape)
+    return required, increase
+
+
+def required_values(name: str, inputs: pd.DataFrame, input_df: pd.DataFrame, target_score: float,
+                    credit_score: np.ndarray = None, bundle=None) -> np.ndarray:
+    """Value of input name each row needs to reach target_score, NaN where no allowed value does.
+
+    inputs are coerced raw inputs (coerce_batch_inputs), input_df their model features
+    (prepare_batch_input) and credit_score their current scores, computed here when not given.
+    Rows already at or above the target keep their current value. Everything is computed with one
+    ModelBundle: bundle if given, else the registry's current one.
+    """
+    bundle = bundle or registry.get()
+    _, feature, (lower, upper), step = ACTIONABLE_INPUTS[name]
+    current = inputs[name].to_numpy(dtype=np.float64)
+    if credit_score is None:
+        _, credit_score, _ = calculate_credit_scores(input_df, bundle=bundle)
+    needs_change = credit_score < target_score
+    gap = _logits(input_df, bundle) - target_logit(target_score)
+
+    required, increase = _closed_form(name, inputs, gap, bundle)
+    required = _round_towards(required, step, increase)
+    feasible = needs_change & np.isfinite(required) & (np.where(increase, required > current, required < current))
+
+    # Rescore with the model; rows that miss the target by rounding error move one more step
+    position = list(input_df.columns).index(feature)
+    for _ in range(MAX_NUDGES + 1):
+        rows = np.flatnonzero(feasible & (required >= lower) & (required <= upper))
+        if len(rows) == 0:
+            break
+        candidate = input_df.iloc[rows].copy()
+        candidate.iloc[:, position] = _scaled(feature, _feature_values(name, inputs.iloc[rows], required[rows]), bundle)
+        _, scores, _ = calculate_credit_scores(candidate, bundle=bundle)
+        missed = rows[scores < target_score]
+        if len(missed) == 0:
+            break
+        required[missed] += np.where(increase[missed], step, -step)
+    else:
+        feasible[missed] = False
+
+    result = np.where(feasible & (required >= lower) & (required <= upper), required, np.nan)
+    return np.where(needs_change, result, current)
+
+
+def minimal_changes(raw_df: pd.DataFrame, target: str = 'Good', inputs=None, bundle=None) -> pd.DataFrame:
+    """For each row of raw_df, the value of each actionable input that alone reaches the target band.
+
+    Returns credit_score plus a '<input>_required' column per input in ACTIONABLE_INPUTS (or the
+    given inputs). A value equal to the current one means the row already meets the target; NaN
+    means no value within the input's allowed range gets there. The whole answer comes from one
+    ModelBundle (bundle if given, else the registry's current one), even if the model is swapped meanwhile.
+    """
+    bundle = bundle or registry.get()
+    target_score = TARGET_BANDS[target]
+    names = list(inputs or ACTIONABLE_INPUTS)
+    coerced = coerce_batch_inputs(raw_df)
+    input_df = prepare_batch_input(coerced, bundle=bundle)
+    _, credit_score, _ = calculate_credit_scores(input_df, bundle=bundle)
+    out = pd.DataFrame({'credit_score': credit_score}, index=coerced.index)
+    for name in names:
+        out[f'{name}_required'] = required_values(name, coerced, input_df, target_score, credit_score, bundle)
+    return out
+
+
+def applicant_changes(applicant: dict, target: str = 'Good') -> pd.DataFrame:
+    """minimal_changes for one applicant as a table: input, current, required, change (reachable ones only)."""
+    coerced = coerce_batch_inputs(pd.DataFrame([applicant]))
+    required = minimal_changes(coerced, target).iloc[0]
+    rows = []
+    for name, (label, _, _, _) in ACTIONABLE_INPUTS.items():
+        value = required[f'{name}_required']
+        current = float(coerced[name].iloc[0])
+        if np.isfinite(value) and value != current:
+            rows.append({'input': label, 'current': current, 'required': value, 'change': value - current})
+    return pd.DataFrame(rows, columns=['input', 'current', 'required', 'change'])
@@ -0,0 +1,157 @@
+"""Persistent score cache shared by every process (and restart) that scores with the same model.
+
+DiskScoreCache is a second level behind prediction_helper.score_cache: single-applicant results
+(default_probability, credit_score, rating) are stored in a SQLite file in WAL mode, so Streamlit
+sessions, the HTTP service and CLI runs on one machine read each other's results. Enable it with
+SAFELEND_SCORE_CACHE=path/to/scores.sqlite (SAFELEND_SCORE_CACHE_SIZE bounds the entries).
+
+Keys are a hash of the model fingerprint (see prediction_helper.model_fingerprint) and the
+normalized inputs. The file also records the fingerprint it was filled for; the first process to
+use a different model empties it. Once there are more than maxsize entries the oldest are evicted.
+Lookups wait at most `timeout` (20 ms by default) for another process's write lock. Any SQLite
+error (a locked or unwritable file) is counted and that call scores uncached, without a write.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+DEFAULT_MAXSIZE = 100_000
+DEFAULT_TIMEOUT = 0.02  # seconds; scoring uncached is far cheaper than waiting on a busy file
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)',
+    # rowid follows insertion order, which is the eviction order
+    'CREATE TABLE IF NOT EXISTS scores (key BLOB UNIQUE NOT NULL, probability REAL NOT NULL, '
+    'credit_score INTEGER NOT NULL, rating TEXT NOT NULL)',
+)
+
+
+def cache_key(fingerprint: str, inputs: tuple) -> bytes:
+    """16-byte key for normalized inputs (prediction_helper.normalize_inputs) under one model."""
+    return hashlib.blake2b(repr((fingerprint, inputs)).encode(), digest_size=16).digest()
+
+
+class DiskScoreCache:
+    """SQLite-backed, size-bounded cache of (default_probability, credit_score, rating) per model and inputs."""
+
+    def __init__(self, path: str, maxsize: int = DEFAULT_MAXSIZE, timeout: float = DEFAULT_TIMEOUT):
+        self.path = path
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._fingerprint = None
+        self._local = threading.local()  # one connection per thread
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            self._local.conn = conn
+        return conn
+
+    def _use_model(self, conn: sqlite3.Connection, fingerprint: str):
+        """Empty the file if it was filled under another model (checked once per model per process)."""
+        if fingerprint == self._fingerprint:
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+            if row is None or row[0] != fingerprint:
+                conn.execute('DELETE FROM scores')
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        self._fingerprint = fingerprint
+
+    def get(self, fingerprint: str, inputs: tuple):
+        """Stored (default_probability, credit_score, rating), or None."""
+        conn = self._connect()
+        self._use_model(conn, fingerprint)
+        row = conn.execute('SELECT probability, credit_score, rating FROM scores WHERE key = ?',
+                           (cache_key(fingerprint, inputs),)).fetchone()
+        if row is None:
+            return None
+        return np.float64(row[0]), int(row[1]), row[2]
+
+    def put(self, fingerprint: str, inputs: tuple, value: tuple):
+        conn = self._connect()
+        self._use_model(conn, fingerprint)
+        probability, credit_score, rating = value
+        cursor = conn.execute('INSERT OR IGNORE INTO scores (key, probability, credit_score, rating) VALUES (?, ?, ?, ?)',
+                              (cache_key(fingerprint, inputs), float(probability), int(credit_score), str(rating)))
+        if cursor.rowcount and cursor.lastrowid > self.maxsize:
+            conn.execute('DELETE FROM scores WHERE rowid <= ?', (cursor.lastrowid - self.maxsize,))
+
+    def get_or_compute(self, fingerprint: str, inputs: tuple, compute):
+        """Stored result for inputs under fingerprint, else compute() (stored for next time)."""
+        try:
+            value = self.get(fingerprint, inputs)
+        except sqlite3.Error:
+            # Locked or unusable file: score without the cache and don't queue behind the lock again
+            with self._lock:
+                self.errors += 1
+            return compute()
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = compute()
+        try:
+            self.put(fingerprint, inputs, value)
+        except sqlite3.Error:
+            with self._lock:
+                self.errors += 1
+        return value
+
+    def clear(self):
+        """Delete every stored entry (for all processes) and reset the counters."""
+        self._connect().execute('DELETE FROM scores')
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.errors = 0
+
+    def __len__(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM scores').fetchone()[0]
+
+    def stats(self) -> dict:
+        try:
+            size = len(self)
+        except sqlite3.Error:
+            size = None
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'path': self.path,
+                'hits': self.hits,
+                'misses': self.misses,
+                'errors': self.errors,
+                'size': size,
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def from_environment():
+    """DiskScoreCache configured by SAFELEND_SCORE_CACHE / SAFELEND_SCORE_CACHE_SIZE, or None when unset."""
+    path = os.environ.get('SAFELEND_SCORE_CACHE', '')
+    if not path:
+        return None
+    return DiskScoreCache(path, int(os.environ.get('SAFELEND_SCORE_CACHE_SIZE', DEFAULT_MAXSIZE)))
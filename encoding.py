@@ -0,0 +1,160 @@
+"""One-hot encoding of the categorical inputs through lookup tables compiled from the model's features.
+
+For each categorical input, the known levels are its CATEGORY_DOMAINS values plus any level the
+model has a '<input>_<level>' feature for. Each level gets a row of a small 0/1 table (one column
+per one-hot feature; reference levels such as 'Mortgage' are all zeros), and an extra all-zero row
+for unknown values. Encoding a batch is then:
+
+    codes = level code per row      (distinct_codes: pd.factorize, or the codes of a Categorical column)
+    onehot = table[codes]           (one fancy index, no string comparisons per row)
+
+Values outside the known levels (a typo, 'Leased', a missing cell) are still encoded as the
+reference level, as before. They are now also counted per input and value, and logged the first
+time each one is seen. CategoricalEncoder.unknown_counts and prediction_helper.metrics_snapshot()
+report them. Only the first MAX_TRACKED_UNKNOWNS distinct values per input are counted by name;
+later ones are pooled under OTHER_UNKNOWN and warned about at most once per WARNING_INTERVAL, so a
+long-running process fed junk values keeps bounded memory and logs.
+"""
+import logging
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from lite_inference import CATEGORICAL_INPUT_COLUMNS, CATEGORY_DOMAINS
+
+logger = logging.getLogger('safelend.encoding')
+
+MAX_TRACKED_UNKNOWNS = 20    # distinct unknown values counted by name per input
+WARNING_INTERVAL = 60.0      # seconds between warnings about pooled (untracked) unknown values
+OTHER_UNKNOWN = '<other>'    # unknown_summary key for the pooled count
+
+
+def distinct_codes(values, code_of, dtype=np.int64) -> np.ndarray:
+    """code_of(value) for every value, calling it once per distinct value; missing values get -1.
+    values is a Series or array-like; a Categorical one is read through its codes.
+    """
+    categorical = values.array if isinstance(values, pd.Series) else values
+    if isinstance(categorical, pd.Categorical):
+        value_codes, uniques = np.asarray(categorical.codes), categorical.categories
+    else:
+        value_codes, uniques = pd.factorize(values if isinstance(values, pd.Series)
+                                            else np.asarray(values, dtype=object))
+    # code -1 (missing) lands on the trailing -1
+    lookup = np.array([code_of(u) for u in uniques] + [-1], dtype=dtype)
+    return lookup[value_codes]
+
+
+class CategoricalEncoder:
+    """Lookup-table one-hot encoder built once per ModelBundle from its feature names."""
+
+    def __init__(self, features, domains=CATEGORY_DOMAINS):
+        features = [str(f) for f in features]
+        self.levels = {}    # input -> known levels, in code order
+        self.features = {}  # input -> one-hot feature names, in table column order
+        self._tables = {}   # input -> (len(levels) + 1, len(features)) int64 table; the last row is unknown
+        self._codes = {}    # input -> {level: code}
+        for col in CATEGORICAL_INPUT_COLUMNS:
+            prefix = f'{col}_'
+            onehot = [f for f in features if f.startswith(prefix)]
+            levels = list(domains.get(col, ()))
+            levels += [f[len(prefix):] for f in onehot if f[len(prefix):] not in levels]
+            table = np.zeros((len(levels) + 1, len(onehot)), dtype=np.int64)
+            for j, feature in enumerate(onehot):
+                table[levels.index(feature[len(prefix):]), j] = 1
+            self.levels[col] = tuple(levels)
+            self.features[col] = onehot
+            self._tables[col] = table
+            self._codes[col] = {level: i for i, level in enumerate(levels)}
+        self.unknown_counts = {col: Counter() for col in CATEGORICAL_INPUT_COLUMNS}
+        self.other_unknown_counts = Counter()  # input -> rows with unknown values beyond MAX_TRACKED_UNKNOWNS
+        self._last_other_warning = {}
+        self._lock = threading.Lock()
+
+    def reference_levels(self, col: str) -> tuple:
+        """Known levels of col that encode to all zeros."""
+        table = self._tables[col]
+        return tuple(level for i, level in enumerate(self.levels[col]) if not table[i].any())
+
+    def codes(self, col: str, values) -> np.ndarray:
+        """Level code of each value of col, or -1 where the value is unknown or missing."""
+        known = self._codes[col]
+        return distinct_codes(values, lambda value: known.get(value, -1))
+
+    def encode(self, inputs) -> dict:
+        """One-hot feature columns (feature name -> int64 array) for a frame or mapping of raw inputs."""
+        encoded = {}
+        for col in CATEGORICAL_INPUT_COLUMNS:
+            values = inputs[col]
+            codes = self.codes(col, values)
+            unknown = codes < 0
+            if unknown.any():
+                rows = np.flatnonzero(unknown)
+                self._record_unknown(col, values.iloc[rows] if isinstance(values, pd.Series)
+                                     else np.asarray(values, dtype=object)[rows])
+            onehot = self._tables[col][codes]  # -1 picks the unknown row
+            for j, feature in enumerate(self.features[col]):
+                encoded[feature] = onehot[:, j]
+        return encoded
+
+    def onehot(self, col: str, value) -> np.ndarray:
+        """One-hot row of a single value of col, in self.features[col] order; unknowns are recorded."""
+        code = self._codes[col].get(value, -1)
+        if code < 0:
+            self._count_unknown(col, Counter({None if pd.isna(value) else value: 1}))
+        return self._tables[col][code]
+
+    def encode_one(self, inputs) -> dict:
+        """One-hot features (feature name -> 0/1) for a single applicant's raw inputs."""
+        encoded = {}
+        for col in CATEGORICAL_INPUT_COLUMNS:
+            encoded.update(zip(self.features[col], self.onehot(col, inputs[col]).tolist()))
+        return encoded
+
+    def _record_unknown(self, col: str, values: np.ndarray):
+        # Missing cells (None, NaN, pd.NA) are all counted under None; most frequent values come first
+        counts = Counter()
+        for value, count in pd.Series(values, dtype=object).value_counts(dropna=False).items():
+            counts[None if pd.isna(value) else value] += int(count)
+        self._count_unknown(col, counts)
+
+    def _count_unknown(self, col: str, counts: Counter):
+        new, other = [], 0
+        with self._lock:
+            seen = self.unknown_counts[col]
+            for value, count in counts.items():
+                if value in seen or len(seen) < MAX_TRACKED_UNKNOWNS:
+                    if value not in seen:
+                        new.append(value)
+                    seen[value] += count
+                else:
+                    other += count
+            warn_other = False
+            if other:
+                self.other_unknown_counts[col] += other
+                now = time.monotonic()
+                if now - self._last_other_warning.get(col, -WARNING_INTERVAL) >= WARNING_INTERVAL:
+                    self._last_other_warning[col] = now
+                    warn_other = True
+            other_total = self.other_unknown_counts[col]
+        for value in new:
+            logger.warning("unknown %s %r is encoded as the reference level %s; known levels: %s",
+                           col, value, '/'.join(self.reference_levels(col)) or 'with no one-hot feature',
+                           ', '.join(self.levels[col]))
+        if warn_other:
+            logger.warning("%d rows so far with further unknown %s values (beyond %d distinct) are encoded as "
+                           "the reference level", other_total, col, MAX_TRACKED_UNKNOWNS)
+
+    def unknown_summary(self) -> dict:
+        """{input: {value: rows}} of the tracked unknown categories, plus OTHER_UNKNOWN for the pooled rest."""
+        with self._lock:
+            summary = {}
+            for col, counts in self.unknown_counts.items():
+                values = {str(value): count for value, count in counts.items()}
+                if self.other_unknown_counts[col]:
+                    values[OTHER_UNKNOWN] = self.other_unknown_counts[col]
+                if values:
+                    summary[col] = values
+            return summary
@@ -0,0 +1,115 @@
+"""Hot reload of the model artifact without restarting the app.
+
+ArtifactWatcher polls the registry's artifact file with os.stat. Once a changed file has stayed
+unchanged for one more poll (so a copy in progress is not picked up), it loads and validates
+the new artifact on the watcher thread, including a warm-up probe batch (see
+prediction_helper.validate_bundle), and only then swaps it into the registry. Scoring calls
+fetch the bundle once per call, so a call that started before the swap finishes on the old
+model and the next one uses the new model. Nothing on the scoring path waits for the load. An
+artifact that fails to load or validate is logged and ignored, and the old model stays live.
+
+Caches follow the swap: score_cache empties itself on its next lookup because the bundle
+changed, and the persistent cache and incremental stores are keyed by model fingerprint.
+
+    watcher = ArtifactWatcher(registry, interval=2.0).start()
+    watcher.stats()   # {'swaps': ..., 'failures': ..., 'fingerprint': ..., 'last_error': ...}
+
+Replace artifacts by renaming a finished file over the old one (model_artifact.export_artifact
+does). Compact artifacts are memory-mapped, so writing into the live file in place would change
+the weights under the running model.
+"""
+import logging
+import os
+import threading
+
+from prediction_helper import ModelRegistry
+
+logger = logging.getLogger('safelend.hot_reload')
+
+DEFAULT_INTERVAL = 2.0
+
+
+def _signature(path: str):
+    """What identifies one version of the file on disk, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+class ArtifactWatcher:
+    """Background thread that swaps a changed, valid artifact into a ModelRegistry."""
+
+    def __init__(self, registry: ModelRegistry, interval: float = DEFAULT_INTERVAL, on_swap=None):
+        self.registry = registry
+        self.interval = interval
+        self.on_swap = on_swap
+        self.swaps = 0
+        self.failures = 0
+        self.last_error = None
+        self._current = _signature(registry.path)
+        self._seen = self._current
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self) -> bool:
+        """Poll once; returns True if a new artifact was swapped in."""
+        signature = _signature(self.registry.path)
+        if signature is None or signature == self._current:
+            self._seen = signature
+            return False
+        if signature != self._seen:
+            self._seen = signature  # changed since the last poll; wait until it stops changing
+            return False
+
+        self._current = signature
+        old = self.registry.get()
+        try:
+            bundle = self.registry.load_candidate()
+        except Exception as e:
+            self.failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.exception("ignoring model artifact %s; keeping %s", self.registry.path, old.fingerprint[:12])
+            return False
+        if bundle.fingerprint == old.fingerprint:
+            return False  # rewritten with the same parameters
+        self.registry.swap(bundle)
+        self.swaps += 1
+        self.last_error = None
+        logger.info("swapped model %s -> %s from %s", old.fingerprint[:12], bundle.fingerprint[:12],
+                    self.registry.path)
+        if self.on_swap is not None:
+            self.on_swap(old, bundle)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:  # keep watching whatever happens
+                logger.exception("model watcher poll failed")
+
+    def start(self) -> 'ArtifactWatcher':
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='artifact-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        bundle = self.registry.get() if self.registry.loaded else None
+        return {
+            'path': self.registry.path,
+            'interval_s': self.interval,
+            'swaps': self.swaps,
+            'failures': self.failures,
+            'fingerprint': bundle.fingerprint if bundle is not None else None,
+            'last_error': self.last_error,
+        }
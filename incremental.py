@@ -0,0 +1,190 @@
+"""Incremental batch scoring: only new or changed applicants are scored.
+
+Each row's 11 raw inputs (after the usual coercion) are hashed to 128 bits with vectorized
+splitmix64 mixing. A ScoreStore on disk
+maps those hashes to (default_probability, credit_score, rating) for one model fingerprint;
+rows found there are served from it and only the rest go through predict_batch. The output is
+identical to predict_batch(raw_df).
+
+    scorer = IncrementalScorer('score_store')
+    scored = scorer.predict_batch(todays_df)   # scorer.stats -> {'rows', 'reused', 'scored'}
+    scorer.save()
+
+score_file_incremental does the same for a file, chunk by chunk (score_cli --incremental DIR).
+The store is a .npz file per model fingerprint, so a new model never sees the old model's scores.
+By default save() keeps the rows seen since the store was opened (the latest batch); pass
+keep_unseen=True to keep older entries too.
+"""
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from batch_scoring import (DEFAULT_CHUNK_SIZE, RATING_CATEGORIES, format_from_path, read_input_chunks,
+                           write_scored_chunks)
+from prediction_helper import RAW_INPUT_COLUMNS, coerce_batch_inputs, predict_batch, registry
+
+# Two independently seeded 64-bit hashes per row; the store is searched on the first and checked on the second
+_SEEDS = (np.uint64(0x5AFE1E9D00000001), np.uint64(0x5AFE1E9D00000002))
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, applied elementwise (uint64 arithmetic wraps)."""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _column_bits(column: pd.Series) -> tuple:
+    """Two uint64 words per value: the raw bits of numbers, a blake2b digest of strings."""
+    values = column.to_numpy() if column.dtype.kind in 'iuf' else column
+    if values.dtype.kind in 'iu':
+        bits = values.astype(np.int64).view(np.uint64)
+        return bits, bits
+    if values.dtype.kind == 'f':
+        values = np.where(np.isnan(values), np.nan, values + 0.0)  # one NaN and one zero
+        bits = values.astype(np.float64).view(np.uint64)
+        return bits, bits
+    codes, uniques = pd.factorize(values)
+    digests = np.array([[int.from_bytes(hashlib.blake2b(str(u).encode(), digest_size=16).digest()[i:i + 8], 'little')
+                         for i in (0, 8)] for u in uniques] + [[0, 0]], dtype=np.uint64)
+    return digests[codes, 0], digests[codes, 1]  # code -1 (missing) picks the trailing zeros
+
+
+def row_hashes(inputs: pd.DataFrame) -> tuple:
+    """(hi, lo) uint64 arrays hashing each row of coerced raw inputs (see coerce_batch_inputs)."""
+    hi = np.full(len(inputs), _SEEDS[0])
+    lo = np.full(len(inputs), _SEEDS[1])
+    for col in RAW_INPUT_COLUMNS:
+        bits_hi, bits_lo = _column_bits(inputs[col])
+        hi = _mix64(hi ^ _mix64(bits_hi + _SEEDS[0]))
+        lo = _mix64(lo ^ _mix64(bits_lo + _SEEDS[1]))
+    return hi, lo
+
+
+class ScoreStore:
+    """hash -> (default_probability, credit_score, rating) for one model fingerprint, kept sorted by hash."""
+
+    def __init__(self, directory: str, fingerprint: str):
+        self.directory = directory
+        self.fingerprint = fingerprint
+        self.path = os.path.join(directory, f'scores-{fingerprint[:16]}.npz')
+        self.hi = np.empty(0, dtype=np.uint64)
+        self.lo = np.empty(0, dtype=np.uint64)
+        self.probability = np.empty(0)
+        self.score = np.empty(0, dtype=np.int64)
+        self.rating = np.empty(0, dtype=np.int8)
+        if os.path.exists(self.path):
+            self._read()
+
+    def __len__(self) -> int:
+        return len(self.hi)
+
+    def _read(self):
+        with np.load(self.path, allow_pickle=False) as data:
+            if str(data['fingerprint']) != self.fingerprint:
+                return  # a different model whose fingerprint shares the file name prefix
+            self.hi, self.lo = data['hi'], data['lo']
+            self.probability, self.score, self.rating = data['probability'], data['score'], data['rating']
+
+    def lookup(self, hi: np.ndarray, lo: np.ndarray) -> np.ndarray:
+        """Index into the store for each (hi, lo), or -1 where it is not stored."""
+        if len(self.hi) == 0:
+            return np.full(len(hi), -1)
+        pos = np.minimum(np.searchsorted(self.hi, hi), len(self.hi) - 1)
+        return np.where((self.hi[pos] == hi) & (self.lo[pos] == lo), pos, -1)
+
+    def replace(self, hi, lo, probability, score, rating):
+        """Set the store's contents; duplicate hashes keep their last entry."""
+        order = np.argsort(hi, kind='stable')[::-1]
+        _, first = np.unique(hi[order], return_index=True)
+        keep = order[first]
+        self.hi, self.lo = hi[keep], lo[keep]
+        self.probability, self.score, self.rating = probability[keep], score[keep], rating[keep]
+
+    def save(self):
+        """Write the store atomically, so readers never see a partial file."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.npz.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, fingerprint=np.array(self.fingerprint), hi=self.hi, lo=self.lo,
+                         probability=self.probability, score=self.score, rating=self.rating)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+class IncrementalScorer:
+    """predict_batch that reuses stored results for unchanged applicants under the current model."""
+
+    def __init__(self, directory: str):
+        self.store = ScoreStore(directory, registry.get().fingerprint)
+        self.stats = {'rows': 0, 'reused': 0, 'scored': 0}
+        self._seen = []
+
+    def predict_batch(self, raw_df: pd.DataFrame) -> pd.DataFrame:
+        """Same output as prediction_helper.predict_batch(raw_df)."""
+        out = coerce_batch_inputs(raw_df)
+        hi, lo = row_hashes(out)
+        idx = self.store.lookup(hi, lo)
+        hit = idx >= 0
+        miss = np.flatnonzero(~hit)
+
+        probability = np.empty(len(out))
+        score = np.empty(len(out), dtype=np.int64)
+        rating = np.empty(len(out), dtype=np.int8)
+        probability[hit] = self.store.probability[idx[hit]]
+        score[hit] = self.store.score[idx[hit]]
+        rating[hit] = self.store.rating[idx[hit]]
+        if len(miss):
+            scored = predict_batch(out.iloc[miss])
+            probability[miss] = scored['default_probability'].to_numpy()
+            score[miss] = scored['credit_score'].to_numpy()
+            rating[miss] = scored['rating'].cat.codes.to_numpy()
+
+        income = out['income'].to_numpy()
+        loan_to_income = np.zeros(len(out))
+        np.divide(out['loan_amount'].to_numpy(), income, out=loan_to_income, where=income != 0)
+        out['loan_to_income'] = loan_to_income
+        out['default_probability'] = probability
+        out['credit_score'] = score
+        out['rating'] = pd.Categorical.from_codes(rating, categories=RATING_CATEGORIES)
+
+        self._seen.append((hi, lo, probability, score, rating))
+        self.stats['rows'] += len(out)
+        self.stats['reused'] += int(hit.sum())
+        self.stats['scored'] += len(miss)
+        return out
+
+    def save(self, keep_unseen: bool = False):
+        """Persist every row scored or reused so far (plus older entries with keep_unseen)."""
+        parts = list(zip(*self._seen)) if self._seen else [[] for _ in range(5)]
+        if keep_unseen:
+            parts = [[old] + list(new) for old, new in zip(
+                (self.store.hi, self.store.lo, self.store.probability, self.store.score, self.store.rating), parts)]
+        if not any(len(p) for p in parts[0]):
+            return
+        self.store.replace(*(np.concatenate(p) for p in parts))
+        self.store.save()
+        self._seen = []
+
+
+def score_file_incremental(source, destination, directory: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                           input_format: str = None, output_format: str = None, summary=None) -> dict:
+    """batch_scoring.score_file through an IncrementalScorer stored in directory (single process, no extras).
+
+    Returns {'rows', 'chunks', 'reused', 'scored'}; the store is saved once every chunk is written.
+    """
+    input_format = input_format or format_from_path(source)
+    output_format = output_format or format_from_path(destination)
+    scorer = IncrementalScorer(directory)
+    chunks = (scorer.predict_batch(chunk) for chunk in read_input_chunks(source, chunk_size, input_format))
+    if summary is not None:
+        chunks = summary.track(chunks)
+    stats = write_scored_chunks(chunks, destination, output_format)
+    scorer.save()
+    return {**stats, 'reused': scorer.stats['reused'], 'scored': scorer.stats['scored']}
@@ -0,0 +1,70 @@
+"""Optional per-stage timing for the scoring pipeline.
+
+Disabled by default; enable with SAFELEND_METRICS=1 or metrics.enable(). Instrumented code reads
+metrics.enabled once per call and only takes timestamps when it is set, so the disabled cost is
+a single attribute check:
+
+    timed = metrics.enabled
+    if timed:
+        t0 = perf_counter()
+    ...
+    if timed:
+        metrics.record('predict', [('prepare', t1 - t0), ...])
+"""
+import os
+import threading
+from time import perf_counter  # noqa: F401 -- re-exported for instrumented modules
+
+
+class StageMetrics:
+    """Thread-safe counters of calls, rows and time per pipeline stage."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def record(self, call: str, stages, rows: int = 1):
+        """Record one call of `call` that processed `rows` rows; stages is [(stage, seconds), ...]."""
+        with self._lock:
+            total = 0.0
+            for stage, seconds in stages:
+                self._add(f'{call}.{stage}', seconds, rows)
+                total += seconds
+            self._add(call, total, rows)
+
+    def _add(self, key: str, seconds: float, rows: int):
+        entry = self._stages.get(key)
+        if entry is None:
+            entry = self._stages[key] = {'count': 0, 'rows': 0, 'total_s': 0.0, 'max_s': 0.0}
+        entry['count'] += 1
+        entry['rows'] += rows
+        entry['total_s'] += seconds
+        entry['max_s'] = max(entry['max_s'], seconds)
+
+    def snapshot(self) -> dict:
+        """Per-stage {count, rows, total_ms, mean_us, max_ms}, keyed 'call' and 'call.stage'."""
+        with self._lock:
+            return {
+                key: {
+                    'count': e['count'],
+                    'rows': e['rows'],
+                    'total_ms': round(e['total_s'] * 1e3, 3),
+                    'mean_us': round(e['total_s'] / e['count'] * 1e6, 3),
+                    'max_ms': round(e['max_s'] * 1e3, 3),
+                }
+                for key, e in sorted(self._stages.items())
+            }
+
+
+metrics = StageMetrics(enabled=os.environ.get('SAFELEND_METRICS', '') not in ('', '0'))
@@ -0,0 +1,256 @@
+"""NumPy-only scoring from the compact model artifact.
+
+For CLI and serverless-style callers where interpreter startup dominates: this module imports
+neither pandas nor scikit-learn, and reads the parameters written by model_artifact. Outputs
+are bit-for-bit identical to prediction_helper.predict / predict_batch.
+
+    from lite_inference import LiteScorer
+    scorer = LiteScorer.load('artifacts/model_params.slm')
+    scorer.predict(28, 1200000, 900000, 36, 20, 30, 30, 2, 'Owned', 'Personal', 'Unsecured')
+    columns = scorer.predict_batch({'age': [28, 45], 'income': [1200000, 800000], ...})
+
+predict_batch takes any mapping of column name -> array-like (a dict of lists, a DataFrame, ...)
+and returns a dict of NumPy arrays with the same columns, in the same order, as predict_batch.
+"""
+import numpy as np
+
+from model_artifact import COMPACT_MODEL_PATH, load_artifact
+
+# Raw applicant inputs accepted by predict_batch, with the value used when a column is missing
+RAW_INPUT_DEFAULTS = {
+    'age': 0,
+    'income': 0,
+    'loan_amount': 0,
+    'loan_tenure_months': 0,
+    'avg_dpd_per_delinquency': 0,
+    'delinquency_ratio': 0,
+    'credit_utilization_ratio': 0,
+    'num_open_accounts': 0,
+    'residence_type': 'Owned',
+    'loan_purpose': 'Personal',
+    'loan_type': 'Unsecured',
+}
+RAW_INPUT_COLUMNS = list(RAW_INPUT_DEFAULTS)
+INT_INPUT_COLUMNS = ('age', 'loan_tenure_months', 'num_open_accounts')
+FLOAT_INPUT_COLUMNS = ('income', 'loan_amount', 'avg_dpd_per_delinquency', 'delinquency_ratio',
+                       'credit_utilization_ratio')
+CATEGORICAL_INPUT_COLUMNS = ('residence_type', 'loan_purpose', 'loan_type')
+# Every value the app offers for each categorical input; the model one-hot encodes all but a reference level
+CATEGORY_DOMAINS = {
+    'residence_type': ('Owned', 'Rented', 'Mortgage'),
+    'loan_purpose': ('Education', 'Home', 'Auto', 'Personal'),
+    'loan_type': ('Unsecured', 'Secured'),
+}
+# Rating bands in score order (the categories of the rating column)
+RATING_CATEGORIES = ['Poor', 'Average', 'Good', 'Excellent', 'Undefined']
+
+
+def get_rating(score):
+    """Map a credit score to its rating band."""
+    if 300 <= score < 500:
+        return 'Poor'
+    elif 500 <= score < 650:
+        return 'Average'
+    elif 650 <= score < 750:
+        return 'Good'
+    elif 750 <= score <= 900:
+        return 'Excellent'
+    else:
+        return 'Undefined'  # in case of any unexpected score
+
+
+def rating_codes(credit_scores: np.ndarray) -> np.ndarray:
+    """Vectorized get_rating as int8 positions in RATING_CATEGORIES."""
+    conditions = [
+        (credit_scores >= 300) & (credit_scores < 500),
+        (credit_scores >= 500) & (credit_scores < 650),
+        (credit_scores >= 650) & (credit_scores < 750),
+        (credit_scores >= 750) & (credit_scores <= 900),
+    ]
+    return np.select(conditions, [0, 1, 2, 3], default=4).astype(np.int8)
+
+
+def rating_for_scores(credit_scores: np.ndarray) -> np.ndarray:
+    """Vectorized get_rating."""
+    return np.asarray(RATING_CATEGORIES, dtype=object)[rating_codes(credit_scores)]
+
+
+def int_column(values: np.ndarray) -> np.ndarray:
+    """values as int64, truncated like int(); NaN or infinite values raise ValueError instead of
+    casting to a huge negative number.
+    """
+    if values.dtype.kind == 'f' and not np.isfinite(values).all():
+        raise ValueError("cannot convert float NaN or infinity to integer")
+    return values.astype(np.int64)
+
+
+def coerce_columns(columns) -> dict:
+    """Raw input arrays with the app's int/float/str coercion; missing columns get RAW_INPUT_DEFAULTS."""
+    n = max((len(columns[col]) for col in RAW_INPUT_COLUMNS if col in columns), default=0)
+    inputs = {}
+    for col, default in RAW_INPUT_DEFAULTS.items():
+        if col in columns:
+            values = np.asarray(columns[col], dtype=object if col in CATEGORICAL_INPUT_COLUMNS else None)
+        else:
+            values = np.full(n, default, dtype=object if isinstance(default, str) else None)
+        if col in INT_INPUT_COLUMNS:
+            values = int_column(values)
+        elif col in FLOAT_INPUT_COLUMNS:
+            values = values.astype(np.float64)
+        inputs[col] = values
+    return inputs
+
+
+def model_features(inputs: dict) -> dict:
+    """Unscaled model feature columns derived from coerced raw inputs (see prepare_input)."""
+    income = inputs['income']
+    loan_to_income = np.zeros(len(income))
+    np.divide(inputs['loan_amount'], income, out=loan_to_income, where=income > 0)
+    return {
+        'age': inputs['age'],
+        'loan_tenure_months': inputs['loan_tenure_months'],
+        'number_of_open_accounts': inputs['num_open_accounts'],
+        'credit_utilization_ratio': inputs['credit_utilization_ratio'],
+        'loan_to_income': loan_to_income,
+        'delinquency_ratio': inputs['delinquency_ratio'],
+        'avg_dpd_per_delinquency': inputs['avg_dpd_per_delinquency'],
+        'residence_type_Owned': inputs['residence_type'] == 'Owned',
+        'residence_type_Rented': inputs['residence_type'] == 'Rented',
+        'loan_purpose_Education': inputs['loan_purpose'] == 'Education',
+        'loan_purpose_Home': inputs['loan_purpose'] == 'Home',
+        'loan_purpose_Personal': inputs['loan_purpose'] == 'Personal',
+        'loan_type_Unsecured': inputs['loan_type'] == 'Unsecured',
+    }
+
+
+def gather_scaling(features, cols_to_scale, scaler) -> tuple:
+    """(scale, offset, clip): the scaler's scale_/min_ in model feature order (1 and 0 for unscaled
+    features), and its feature_range when it clips, else None.
+    """
+    scale_pos = {col: i for i, col in enumerate(cols_to_scale)}
+    scale = np.ones(len(features))
+    offset = np.zeros(len(features))
+    for j, feature in enumerate(features):
+        if feature in scale_pos:
+            scale[j] = scaler.scale_[scale_pos[feature]]
+            offset[j] = scaler.min_[scale_pos[feature]]
+    clip = tuple(scaler.feature_range) if getattr(scaler, 'clip', False) else None
+    return scale, offset, clip
+
+
+def scale_features(X: np.ndarray, scale: np.ndarray, offset: np.ndarray, clip) -> np.ndarray:
+    """Apply the gathered scaling to X in place: the same arithmetic as MinMaxScaler.transform."""
+    X *= scale
+    X += offset
+    if clip is not None:
+        np.clip(X, clip[0], clip[1], out=X)
+    return X
+
+
+def linear_scores(X: np.ndarray, coef_t: np.ndarray, intercept: np.ndarray, base_score=300, scale_length=600):
+    """(default_probability, unrounded credit_score) arrays for a scaled, C-ordered feature matrix."""
+    # A stacked (n, 1, k) @ (k, 1) product over C-ordered rows runs the same per-row dot kernel as
+    # the single-row path, so results are bit-identical to calculate_credit_score (a plain gemv is not).
+    x = np.matmul(X[:, np.newaxis, :], coef_t)[:, 0, :] + intercept
+    default_probability = (1 / (1 + np.exp(-x))).flatten()
+    credit_score = base_score + (1 - default_probability) * scale_length
+    if np.isnan(credit_score).any():
+        raise ValueError("cannot convert float NaN to integer")
+    return default_probability, credit_score
+
+
+def top_contributions(X: np.ndarray, coef: np.ndarray, features, top_k: int = 3) -> tuple:
+    """Top-k (feature names, contributions) per row of a scaled feature matrix, largest first.
+
+    The full (rows x features) contribution matrix is one elementwise product against coef[0];
+    the top_k per row are picked with argpartition and only those k are sorted. A slot whose
+    contribution is not positive does not push risk up, so it is blanked: None and NaN.
+    """
+    contribs = X * coef[0]
+    top_k = min(top_k, contribs.shape[1])
+    if top_k <= 0 or len(contribs) == 0:
+        return np.empty((len(contribs), 0), dtype=object), np.empty((len(contribs), 0))
+    top_idx = np.argpartition(-contribs, top_k - 1, axis=1)[:, :top_k]
+    top_vals = np.take_along_axis(contribs, top_idx, axis=1)
+    order = np.argsort(-top_vals, axis=1, kind='stable')
+    top_idx = np.take_along_axis(top_idx, order, axis=1)
+    top_vals = np.take_along_axis(top_vals, order, axis=1)
+    names = np.asarray(features, dtype=object)[top_idx]
+    blank = ~(top_vals > 0)
+    names[blank] = None
+    top_vals[blank] = np.nan
+    return names, top_vals
+
+
+class LiteScorer:
+    """Vectorized scoring with the scaler's min_/scale_ gathered into model feature order."""
+
+    def __init__(self, model_data: dict, base_score=300, scale_length=600):
+        self.features = list(model_data['features'])
+        model = model_data['model']
+        self.scale, self.offset, self.clip = gather_scaling(self.features, list(model_data['cols_to_scale']),
+                                                            model_data['scaler'])
+        self.coef = np.asarray(model.coef_)
+        self.coef_t = np.ascontiguousarray(self.coef.T)
+        self.intercept = np.asarray(model.intercept_)
+        self.base_score = base_score
+        self.scale_length = scale_length
+
+    @classmethod
+    def load(cls, path: str = COMPACT_MODEL_PATH) -> 'LiteScorer':
+        return cls(load_artifact(path))
+
+    def feature_matrix(self, inputs: dict) -> np.ndarray:
+        """Scaled (rows x features) matrix, C-ordered, from coerced raw inputs."""
+        derived = model_features(inputs)
+        missing = [f for f in self.features if f not in derived]
+        if missing:
+            raise ValueError(f"LiteScorer cannot build model features: {missing}")
+        X = np.empty((len(inputs['age']), len(self.features)))
+        for j, feature in enumerate(self.features):
+            X[:, j] = derived[feature]
+        return scale_features(X, self.scale, self.offset, self.clip)
+
+    def scores(self, X: np.ndarray):
+        """(default_probability, credit_score, rating) arrays for a feature_matrix."""
+        default_probability, credit_score = linear_scores(X, self.coef_t, self.intercept, self.base_score,
+                                                          self.scale_length)
+        return default_probability, credit_score.astype(np.int64), rating_for_scores(credit_score)
+
+    def top_contributions(self, X: np.ndarray, top_k: int = 3):
+        """Top-k (feature names, contributions) per row, largest first (see top_contributions)."""
+        return top_contributions(X, self.coef, self.features, top_k)
+
+    def predict(self, age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
+                delinquency_ratio, credit_utilization_ratio, num_open_accounts, residence_type,
+                loan_purpose, loan_type):
+        """Return (default_probability, credit_score, rating) for one applicant."""
+        # Numbers are used as given (not truncated to int), like prepare_input
+        numbers = (age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
+                   delinquency_ratio, credit_utilization_ratio, num_open_accounts)
+        inputs = {col: np.array([float(v)]) for col, v in zip(RAW_INPUT_COLUMNS, numbers)}
+        for col, value in zip(CATEGORICAL_INPUT_COLUMNS, (residence_type, loan_purpose, loan_type)):
+            inputs[col] = np.array([str(value)], dtype=object)
+        probability, credit_score, rating = self.scores(self.feature_matrix(inputs))
+        return probability[0], int(credit_score[0]), rating[0]
+
+    def predict_batch(self, columns, explain: bool = False, top_k: int = 3) -> dict:
+        """Score a mapping of raw input columns; returns the predict_batch output columns as arrays."""
+        out = coerce_columns(columns)
+        X = self.feature_matrix(out)
+        probability, credit_score, rating = self.scores(X)
+
+        income = out['income']
+        loan_to_income = np.zeros(len(income))
+        np.divide(out['loan_amount'], income, out=loan_to_income, where=income != 0)
+        out['loan_to_income'] = loan_to_income
+        out['default_probability'] = probability
+        out['credit_score'] = credit_score
+        out['rating'] = rating
+
+        if explain:
+            names, contribs = self.top_contributions(X, top_k)
+            for i in range(names.shape[1]):
+                out[f'reason_{i + 1}'] = names[:, i]
+                out[f'reason_{i + 1}_contribution'] = contribs[:, i]
+        return out
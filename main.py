@@ -2,9 +2,31 @@ import streamlit as st
 import json
 import io
 import pandas as pd
+import numpy as np
 import plotly.express as px
-import math
-from prediction_helper import predict, explain_from_inputs, predict_batch, batch_template
+import functools
+import os
+import shutil
+import tempfile
+import weakref
+from prediction_helper import predict, explain_from_inputs, batch_template, registry, metrics_snapshot, top_reasons
+from instrumentation import metrics
+from batch_scoring import read_input_chunks, score_file
+from affordability import DEFAULT_DTI_PCT, DEFAULT_INTEREST_PA, affordability_grid, max_principal
+from portfolio import SEGMENT_COLUMNS, PortfolioSummary
+from counterfactuals import TARGET_BANDS, applicant_changes
+from sensitivity import SWEEPABLE_INPUTS, default_sweep_values, sensitivity_matrix, sensitivity_sweep
+from hot_reload import DEFAULT_INTERVAL, ArtifactWatcher
+from validation import RejectLog
+
+# Rows of batch results rendered in the browser; the full output is available via download
+BATCH_PREVIEW_ROWS = 1000
+# Download label -> (batch_scoring format, MIME type)
+BATCH_OUTPUT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Feather": ("feather", "application/vnd.apache.arrow.file"),
+}
 
 # Page configuration
 st.set_page_config(
@@ -14,6 +36,70 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+
+@st.cache_resource(show_spinner="Loading credit risk model...")
+def load_model():
+    # Loaded once per server process and shared across sessions and reruns;
+    # clearing Streamlit's resource cache reloads the artifact from disk.
+    return registry.reload()
+
+
+@st.cache_resource
+def model_watcher():
+    # One watcher per server process swaps in a new artifact without a restart (see hot_reload.py);
+    # SAFELEND_WATCH_INTERVAL=0 turns it off.
+    interval = float(os.environ.get('SAFELEND_WATCH_INTERVAL', DEFAULT_INTERVAL))
+    return ArtifactWatcher(registry, interval).start() if interval > 0 else None
+
+
+class ScoredUpload(dict):
+    """score_upload's result; its temp directory is deleted once the cache has dropped it."""
+
+
+@st.cache_resource(max_entries=2, show_spinner="Scoring the upload...")
+def score_upload(upload_id: str, fingerprint: str, _source, explain: bool, top_k: int, affordability: bool,
+                 out_format: str) -> ScoredUpload:
+    # Scored once per upload, options and model (upload_id and fingerprint are the cache key), so widget
+    # changes further down the Batch tab rerun the script without re-reading and re-scoring the file.
+    # Chunks go to a temp file so large uploads are never held as one DataFrame; the cache keeps only
+    # the file paths, the summary and the previews, and downloads read the files when clicked.
+    tmp_dir = tempfile.mkdtemp(prefix="safelend_batch_")
+    out_path = os.path.join(tmp_dir, f"safelend_batch_results.{out_format}")
+    summary = PortfolioSummary()
+    # Invalid rows are set aside with their reasons instead of failing the whole upload
+    rejects_path = os.path.join(tmp_dir, "safelend_batch_rejects.csv")
+    rejects = RejectLog(rejects_path)
+    try:
+        stats = score_file(_source, out_path, explain=explain, top_k=top_k, affordability=affordability,
+                           input_format="csv", output_format=out_format, summary=summary, rejects=rejects)
+        result = ScoredUpload(
+            stats=stats,
+            rows=rejects.rows,
+            summary=summary,
+            preview=next(read_input_chunks(out_path, BATCH_PREVIEW_ROWS, out_format), pd.DataFrame()),
+            rejects_preview=pd.read_csv(rejects_path, nrows=BATCH_PREVIEW_ROWS),
+            results_path=out_path,
+            rejects_path=rejects_path,
+        )
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    weakref.finalize(result, shutil.rmtree, tmp_dir, ignore_errors=True)
+    return result
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def set_diagnostics():
+    metrics.enabled = st.session_state.diagnostics_enabled
+
+
+load_model()
+watcher = model_watcher()
+
 st.markdown(
     """
     <style>
@@ -841,13 +927,60 @@ if st.session_state.last_result is not None:
                 </div>
                 """, unsafe_allow_html=True)
 
+        # Smallest change to a single input that reaches a better rating band
+        better_bands = [band for band, floor in TARGET_BANDS.items() if credit_score < floor]
+        if better_bands:
+            st.markdown("#### 🎯 Path to a Better Rating")
+            target_band = st.selectbox("Target rating", better_bands, key="counterfactual_target")
+            changes = applicant_changes(st.session_state.last_inputs, target_band)
+            if changes.empty:
+                st.info(f"No single actionable input reaches {target_band} on its own; several changes are needed.")
+            else:
+                st.caption(f"Each change below is enough on its own to reach {TARGET_BANDS[target_band]}+ "
+                           f"({target_band}), with every other input unchanged.")
+                for row in changes.itertuples():
+                    st.markdown(f"- **{row.input}**: {row.current:,.0f} → {row.required:,.0f} ({row.change:+,.0f})")
+
     with tab_explain:
         prob_e, score_e, rating_e, contrib_df = explain_from_inputs(
             **{k: st.session_state.last_inputs[k] for k in ['age','income','loan_amount','loan_tenure_months','avg_dpd_per_delinquency','delinquency_ratio','credit_utilization_ratio','num_open_accounts','residence_type','loan_purpose','loan_type']}
         )
         st.caption("Top feature contributions (linear model view).")
         top_k = st.slider("Show top K", 3, 15, 5)
-        st.dataframe(contrib_df.head(top_k), use_container_width=True)
+        st.dataframe(top_reasons(contrib_df, top_k), use_container_width=True)
+
+        st.markdown("#### 🎚️ What-if Sensitivity")
+        st.caption("Vary one or two inputs around this applicant. The whole grid is scored in one batch call.")
+        w1, w2, w3 = st.columns(3)
+        with w1:
+            sweep_x = st.selectbox("Vary", list(SWEEPABLE_INPUTS), format_func=SWEEPABLE_INPUTS.get)
+        with w2:
+            sweep_y = st.selectbox(
+                "Against (optional)",
+                [None] + [name for name in SWEEPABLE_INPUTS if name != sweep_x],
+                format_func=lambda name: "None (curve)" if name is None else SWEEPABLE_INPUTS[name],
+            )
+        with w3:
+            sweep_points = st.slider("Points per input", 10, 100, 50, 10)
+
+        sweep_base = st.session_state.last_inputs
+        sweeps = {sweep_x: default_sweep_values(sweep_x, sweep_base, sweep_points)}
+        if sweep_y is not None:
+            sweeps[sweep_y] = default_sweep_values(sweep_y, sweep_base, sweep_points)
+        sweep_df = sensitivity_sweep(sweep_base, sweeps)
+
+        if sweep_y is None:
+            fig_sweep = px.line(sweep_df, x=sweep_x, y='credit_score', hover_data=['default_probability', 'rating'],
+                                labels={sweep_x: SWEEPABLE_INPUTS[sweep_x], 'credit_score': 'Credit Score'})
+            fig_sweep.add_vline(x=sweep_base[sweep_x], line_dash="dash", line_color="#64748b",
+                                annotation_text="Current")
+        else:
+            fig_sweep = px.imshow(
+                sensitivity_matrix(sweep_df, sweep_x, sweep_y),
+                origin='lower', aspect='auto', color_continuous_scale='RdYlGn',
+                labels={'x': SWEEPABLE_INPUTS[sweep_x], 'y': SWEEPABLE_INPUTS[sweep_y], 'color': 'Credit Score'},
+            )
+        st.plotly_chart(fig_sweep, use_container_width=True)
 
     with tab_afford:
         base = st.session_state.last_inputs or {}
@@ -862,29 +995,32 @@ if st.session_state.last_result is not None:
         with a4:
             tenure_m = st.number_input("Tenure (months)", min_value=6, value=int(base.get('loan_tenure_months', 36)), step=6)
 
-        monthly_income = aff_income / 12.0
-        max_emi = monthly_income * (dti_target / 100.0)
-        r = (interest_pa / 100.0) / 12.0
-        n = max(tenure_m, 1)
-        if r > 0:
-            denom = (1 - math.pow(1 + r, -n))
-            max_principal = max_emi * (denom / r)
-        else:
-            max_principal = max_emi * n
+        max_loan = float(max_principal(aff_income, dti_target, interest_pa, tenure_m))
 
         current_principal = float(base.get('loan_amount', loan_amount))
-        emi_ratio = min(max(current_principal / max(1.0, max_principal), 0.0), 2.0)
+        emi_ratio = min(max(current_principal / max(1.0, max_loan), 0.0), 2.0)
 
         m1, m2, m3 = st.columns(3)
         with m1:
-            st.metric("Max Affordable Loan", f"₹{max_principal:,.0f}")
+            st.metric("Max Affordable Loan", f"₹{max_loan:,.0f}")
         with m2:
             st.metric("Current Loan", f"₹{current_principal:,.0f}")
         with m3:
-            gap = max_principal - current_principal
+            gap = max_loan - current_principal
             st.metric("Affordability Gap", f"₹{gap:,.0f}")
         st.progress(min(int(emi_ratio * 50), 100))
 
+        with st.expander("📐 Interest × tenure grid"):
+            grid_rates = np.arange(5.0, 24.5, 1.0)
+            grid_tenures = np.arange(12, 373, 12)
+            grid = affordability_grid(aff_income, grid_rates, grid_tenures, [dti_target])[:, :, 0]
+            fig_aff = px.imshow(
+                grid, x=grid_tenures, y=grid_rates, origin='lower', aspect='auto', color_continuous_scale='Blues',
+                labels={'x': 'Tenure (months)', 'y': 'Interest (p.a. %)', 'color': 'Max loan (₹)'},
+            )
+            st.caption(f"Max affordable loan at {dti_target}% DTI for each interest rate and tenure.")
+            st.plotly_chart(fig_aff, use_container_width=True)
+
     with tab_compare:
         st.caption("Compare risk across presets.")
         c_left, c_right = st.columns(2)
@@ -921,24 +1057,108 @@ if st.session_state.last_result is not None:
     with tab_batch:
         st.caption("Upload a CSV to score multiple applicants at once. Columns should match the app inputs.")
         demo = st.checkbox("Use template", value=False)
+        with_reasons = st.checkbox("Add top reason codes", value=False, help="Per-applicant features that increase default risk the most")
+        reason_k = st.slider("Reason codes per applicant", 1, 5, 3, disabled=not with_reasons)
+        with_afford = st.checkbox("Add affordability", value=False,
+                                  help=f"EMI, max affordable loan and gap at {DEFAULT_INTEREST_PA:g}% p.a. and {DEFAULT_DTI_PCT:g}% DTI")
+        out_label = st.selectbox("Results format", list(BATCH_OUTPUT_FORMATS), help="Columnar formats store typed columns and load much faster downstream")
+        out_format, out_mime = BATCH_OUTPUT_FORMATS[out_label]
         uploaded = st.file_uploader("CSV file", type=["csv"])
-        df_in = None
+        source = None
         if demo:
-            df_in = batch_template()
+            source = io.StringIO(batch_template().to_csv(index=False))
         elif uploaded is not None:
-            df_in = pd.read_csv(uploaded)
-        if df_in is not None:
-            st.dataframe(df_in.head(), use_container_width=True)
+            source = uploaded
+        if source is not None:
+            st.dataframe(pd.read_csv(source, nrows=5), use_container_width=True)
+            source.seek(0)
             try:
-                df_out = predict_batch(df_in)
-                st.dataframe(df_out, use_container_width=True)
-                csv_buf = io.StringIO()
-                df_out.to_csv(csv_buf, index=False)
-                st.download_button("⬇️ Download Results (CSV)", data=csv_buf.getvalue(), file_name="safelend_batch_results.csv", mime="text/csv")
+                upload_id = "template" if demo else uploaded.file_id
+                scored = score_upload(upload_id, registry.get().fingerprint, source, with_reasons, reason_k,
+                                      with_afford, out_format)
+                stats, summary = scored['stats'], scored['summary']
+                file_name = f"safelend_batch_results.{out_format}"
+                st.caption(f"Scored {stats['rows']:,} rows in {stats['chunks']:,} chunk(s).")
+                if stats['rejected']:
+                    st.warning(f"{stats['rejected']:,} of {scored['rows']:,} rows failed validation and were not scored.")
+                    with st.expander("Rejected rows"):
+                        st.dataframe(scored['rejects_preview'], use_container_width=True)
+                    # Callables read the file only when the button is clicked
+                    st.download_button("⬇️ Download Rejected Rows (CSV)",
+                                       data=functools.partial(read_file, scored['rejects_path']),
+                                       file_name="safelend_batch_rejects.csv", mime="text/csv")
+
+                # Portfolio summary, aggregated while the chunks were written; no rows are sent to the browser
+                totals = summary.totals()
+                p1, p2, p3, p4 = st.columns(4)
+                with p1:
+                    st.metric("Applicants", f"{totals['applicants']:,}")
+                with p2:
+                    st.metric("Exposure", f"₹{totals['exposure']:,.0f}")
+                with p3:
+                    st.metric("Mean Default Probability", f"{totals['mean_default_probability']:.1%}")
+                with p4:
+                    st.metric("Expected Loss", f"₹{totals['expected_loss']:,.0f}",
+                              help=f"Σ default probability × loan amount × LGD ({totals['lgd']:.0%})")
+                c1, c2 = st.columns(2)
+                with c1:
+                    ratings_df = summary.ratings().reset_index()
+                    st.plotly_chart(px.bar(ratings_df, x='rating', y='applicants', color='rating',
+                                           title="Applicants by rating"), use_container_width=True)
+                with c2:
+                    hist_df = summary.score_histogram()
+                    st.plotly_chart(px.bar(hist_df, x='score_from', y='applicants', title="Credit score distribution",
+                                           labels={'score_from': 'Credit Score'}), use_container_width=True)
+                st.markdown("**Default probability percentiles**")
+                st.dataframe(summary.probability_percentiles().to_frame().T, use_container_width=True)
+                segment = st.selectbox("Expected loss by", SEGMENT_COLUMNS,
+                                       format_func=lambda col: col.replace('_', ' ').title())
+                st.dataframe(summary.segments(segment), use_container_width=True)
+
+                with st.expander(f"Preview the first {BATCH_PREVIEW_ROWS:,} scored rows"):
+                    st.dataframe(scored['preview'], use_container_width=True)
+                st.download_button(f"⬇️ Download Results ({out_label})",
+                                   data=functools.partial(read_file, scored['results_path']),
+                                   file_name=file_name, mime=out_mime)
             except Exception as e:
                 st.error(f"Batch scoring failed: {e}")
         
 
+# Diagnostics: per-stage timings collected by prediction_helper (see instrumentation.py)
+with st.sidebar:
+    with st.expander("🩺 Diagnostics"):
+        st.toggle(
+            "Collect stage timings",
+            value=metrics.enabled,
+            key="diagnostics_enabled",
+            # The flag is process-wide, so only a change of this toggle writes it; the callback runs
+            # before the rerun, so the change applies before that run scores anything
+            on_change=set_diagnostics,
+            help="Times input preparation, scaling, the dot product and rating for every scoring call. "
+                 "Applies to the whole server process.",
+        )
+        snapshot = metrics_snapshot()
+        if snapshot['stages']:
+            stage_df = pd.DataFrame.from_dict(snapshot['stages'], orient='index')
+            stage_df.index.name = 'stage'
+            st.dataframe(stage_df, use_container_width=True)
+        else:
+            st.caption("No timings recorded yet. Enable collection and score an applicant.")
+        cache = snapshot['score_cache']
+        st.caption(f"Score cache: {cache['hits']} hits, {cache['misses']} misses, "
+                   f"{cache['size']}/{cache['maxsize']} entries ({cache['hit_rate']:.0%} hit rate)")
+        for col, values in snapshot['unknown_categories'].items():
+            st.caption(f"Unknown {col} values scored as the reference level: "
+                       + ", ".join(f"{value} ({count:,})" for value, count in values.items()))
+        if watcher is not None:
+            reload_stats = watcher.stats()
+            st.caption(f"Model {reload_stats['fingerprint'][:12]}: {reload_stats['swaps']} hot swaps, "
+                       f"{reload_stats['failures']} rejected artifacts, checked every {reload_stats['interval_s']:g} s")
+        if st.button("Reset timings"):
+            metrics.reset()
+            st.rerun()
+
+
 # Footer
 st.divider()
 
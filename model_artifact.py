@@ -0,0 +1,199 @@
+"""Compact, versioned artifact for the linear credit risk model.
+
+The joblib artifact pickles a LogisticRegression and a MinMaxScaler, so loading it imports
+scikit-learn and unpickles a private copy in every process. Inference only needs the
+coefficients, intercept, scaler min_/scale_ and the column names, which this module stores as:
+
+    8-byte magic | uint64 header length | JSON header | float64 arrays, each 64-byte aligned
+
+The JSON header carries the format version, column names, scaler settings and the offset,
+shape and dtype of every array. load_artifact memory-maps the file and returns read-only
+views of the arrays, so worker processes loading the same file share one copy in the page
+cache. The loaded dict has the same keys as the joblib artifact and gives the same scores.
+
+    python model_artifact.py artifacts/model_data.joblib artifacts/model_params.slm
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b'SLMODEL\x00'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+COMPACT_MODEL_PATH = 'artifacts/model_params.slm'
+
+_LENGTH = struct.Struct('<Q')
+_ARRAYS = ('coef', 'intercept', 'scale', 'min')
+
+
+class LinearModel:
+    """The parts of a fitted binary linear classifier that scoring reads."""
+
+    def __init__(self, coef_: np.ndarray, intercept_: np.ndarray):
+        self.coef_ = coef_
+        self.intercept_ = intercept_
+
+
+class ArrayScaler:
+    """MinMaxScaler.transform from stored min_/scale_; the arithmetic matches scikit-learn's."""
+
+    def __init__(self, min_: np.ndarray, scale_: np.ndarray, feature_range=(0, 1), clip: bool = False):
+        self.min_ = min_
+        self.scale_ = scale_
+        self.feature_range = tuple(feature_range)
+        self.clip = clip
+
+    def transform(self, X) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)
+        X *= self.scale_
+        X += self.min_
+        if self.clip:
+            np.clip(X, self.feature_range[0], self.feature_range[1], out=X)
+        return X
+
+
+def _align(n: int) -> int:
+    return -(-n // ALIGNMENT) * ALIGNMENT
+
+
+def export_artifact(model_data: dict, path: str) -> dict:
+    """Write model_data (the joblib artifact's dict) to path in the compact format; returns the header."""
+    model = model_data['model']
+    scaler = model_data['scaler']
+    if np.ndim(model.coef_) != 2 or model.coef_.shape[0] != 1:
+        raise ValueError("only binary linear models (coef_ of shape (1, n_features)) can be exported")
+    arrays = {
+        'coef': model.coef_,
+        'intercept': model.intercept_,
+        'scale': scaler.scale_,
+        'min': scaler.min_,
+    }
+    arrays = {name: np.ascontiguousarray(a, dtype='<f8') for name, a in arrays.items()}
+
+    layout = {}
+    offset = 0
+    for name in _ARRAYS:
+        layout[name] = {'offset': offset, 'shape': list(arrays[name].shape), 'dtype': '<f8'}
+        offset = _align(offset + arrays[name].nbytes)
+    header = {
+        'format_version': FORMAT_VERSION,
+        'model_type': type(model).__name__,
+        'features': [str(f) for f in model_data['features']],
+        'cols_to_scale': [str(c) for c in model_data['cols_to_scale']],
+        'scaler': {
+            'feature_range': [float(v) for v in scaler.feature_range],
+            'clip': bool(getattr(scaler, 'clip', False)),
+        },
+        'arrays': layout,
+        'sha256': hashlib.sha256(b''.join(arrays[name].tobytes() for name in _ARRAYS)).hexdigest(),
+    }
+
+    header_bytes = json.dumps(header, indent=1).encode()
+    data_start = _align(len(MAGIC) + _LENGTH.size + len(header_bytes))
+    header_bytes = header_bytes.ljust(data_start - len(MAGIC) - _LENGTH.size, b' ')
+    # Write beside path and rename over it: processes that mmap'd the old file keep reading it intact
+    tmp_path = f'{path}.tmp{os.getpid()}'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC + _LENGTH.pack(len(header_bytes)) + header_bytes)
+            for name in _ARRAYS:
+                f.seek(data_start + layout[name]['offset'])
+                f.write(arrays[name].tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return header
+
+
+def is_compact_artifact(path: str) -> bool:
+    """True if path starts with the compact artifact's magic bytes."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def read_header(buf) -> tuple:
+    """Parse the magic and JSON header from the start of buf; returns (header, data_start)."""
+    if bytes(buf[:len(MAGIC)]) != MAGIC:
+        raise ValueError("not a SafeLend compact model artifact")
+    (length,) = _LENGTH.unpack_from(buf, len(MAGIC))
+    data_start = len(MAGIC) + _LENGTH.size + length
+    header = json.loads(bytes(buf[len(MAGIC) + _LENGTH.size:data_start]))
+    if header.get('format_version', 0) > FORMAT_VERSION:
+        raise ValueError(f"artifact format version {header['format_version']} is newer than "
+                         f"supported version {FORMAT_VERSION}")
+    return header, data_start
+
+
+def _check_arrays(header: dict, arrays: dict):
+    """Raise ValueError unless the arrays have the shapes the column lists imply and match the header's sha256."""
+    expected = {
+        'coef': (1, len(header['features'])),
+        'intercept': (1,),
+        'scale': (len(header['cols_to_scale']),),
+        'min': (len(header['cols_to_scale']),),
+    }
+    for name, shape in expected.items():
+        if arrays[name].shape != shape:
+            raise ValueError(f"artifact array {name} has shape {arrays[name].shape}, expected {shape}")
+    digest = hashlib.sha256(b''.join(arrays[name].tobytes() for name in _ARRAYS)).hexdigest()
+    if digest != header.get('sha256'):
+        raise ValueError("artifact arrays do not match the header's sha256 (corrupt or modified file)")
+
+
+def load_artifact(path: str = COMPACT_MODEL_PATH, use_mmap: bool = True) -> dict:
+    """Load a compact artifact as {'model', 'scaler', 'features', 'cols_to_scale', 'header'}.
+
+    With use_mmap the arrays are read-only views of the mapped file; otherwise they are
+    read into private memory. Raises ValueError if the array shapes do not fit the column
+    lists or the arrays do not hash to the header's sha256.
+    """
+    with open(path, 'rb') as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if use_mmap else f.read()
+    header, data_start = read_header(buf)
+    missing = [name for name in _ARRAYS if name not in header['arrays']]
+    if missing:
+        raise ValueError(f"artifact is missing arrays: {', '.join(missing)}")
+    arrays = {}
+    for name in _ARRAYS:
+        spec = header['arrays'][name]
+        shape = tuple(spec['shape'])
+        count = int(np.prod(shape, dtype=np.int64))
+        arrays[name] = np.frombuffer(buf, dtype=spec['dtype'], count=count,
+                                     offset=data_start + spec['offset']).reshape(shape)
+    _check_arrays(header, arrays)
+    scaler_spec = header['scaler']
+    return {
+        'model': LinearModel(arrays['coef'], arrays['intercept']),
+        'scaler': ArrayScaler(arrays['min'], arrays['scale'], scaler_spec['feature_range'], scaler_spec['clip']),
+        'features': header['features'],
+        'cols_to_scale': header['cols_to_scale'],
+        'header': header,
+    }
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export the joblib model artifact to the compact format")
+    parser.add_argument('source', nargs='?', default='artifacts/model_data.joblib')
+    parser.add_argument('output', nargs='?', default=COMPACT_MODEL_PATH)
+    args = parser.parse_args(argv)
+
+    import joblib
+
+    header = export_artifact(joblib.load(args.source), args.output)
+    print(f"wrote {args.output}: format v{header['format_version']}, {header['model_type']}, "
+          f"{len(header['features'])} features, sha256 {header['sha256'][:12]}")
+
+
+if __name__ == '__main__':
+    main()
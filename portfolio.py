@@ -0,0 +1,134 @@
+"""Portfolio summaries of scored batches, built in one streaming pass.
+
+PortfolioSummary takes scored chunks (predict_batch output) one at a time and keeps only fixed-size
+aggregates: rating counts, a credit score histogram, a fine default-probability histogram for
+percentiles, and per-segment exposure and expected loss by loan_purpose, loan_type and
+residence_type. Memory does not grow with the number of rows.
+
+    summary = PortfolioSummary()
+    score_file('applicants.csv', 'scored.parquet', summary=summary)
+    summary.ratings(); summary.segments('loan_purpose')
+
+Expected loss is default_probability x LGD x loan_amount (exposure at default), with a single
+loss-given-default assumption. Probability percentiles are read from a histogram with 1e-4 wide
+bins, so they are accurate to 1e-4.
+"""
+import numpy as np
+import pandas as pd
+
+from batch_scoring import RATING_CATEGORIES
+
+SEGMENT_COLUMNS = ('loan_purpose', 'loan_type', 'residence_type')
+DEFAULT_LGD = 0.45
+PERCENTILES = (1, 5, 10, 25, 50, 75, 90, 95, 99)
+
+_PROBABILITY_BINS = 10_000
+_SCORE_MIN, _SCORE_MAX = 300, 900
+
+
+class PortfolioSummary:
+    """Streaming aggregates over scored chunks; see the module docstring."""
+
+    def __init__(self, lgd: float = DEFAULT_LGD, score_bin: int = 10):
+        self.lgd = lgd
+        self.score_bin = score_bin
+        self.rows = 0
+        self._ratings = dict.fromkeys(RATING_CATEGORIES, 0)
+        self._scores = np.zeros((_SCORE_MAX - _SCORE_MIN) // score_bin, dtype=np.int64)
+        self._probabilities = np.zeros(_PROBABILITY_BINS, dtype=np.int64)
+        # segment column -> value -> [count, exposure, sum of default probability, expected loss]
+        self._segments = {col: {} for col in SEGMENT_COLUMNS}
+
+    def update(self, scored: pd.DataFrame):
+        """Add one scored chunk to the aggregates."""
+        if scored.empty:
+            return
+        self.rows += len(scored)
+        for rating, count in scored['rating'].astype(str).value_counts().items():
+            self._ratings[rating] = self._ratings.get(rating, 0) + int(count)
+
+        scores = scored['credit_score'].to_numpy(dtype=np.int64)
+        score_bins = np.clip((scores - _SCORE_MIN) // self.score_bin, 0, len(self._scores) - 1)
+        self._scores += np.bincount(score_bins, minlength=len(self._scores))
+
+        probability = scored['default_probability'].to_numpy(dtype=np.float64)
+        prob_bins = np.clip((probability * _PROBABILITY_BINS).astype(np.int64), 0, _PROBABILITY_BINS - 1)
+        self._probabilities += np.bincount(prob_bins, minlength=_PROBABILITY_BINS)
+
+        exposure = scored['loan_amount'].to_numpy(dtype=np.float64)
+        expected_loss = probability * self.lgd * exposure
+        for col in SEGMENT_COLUMNS:
+            codes, values = pd.factorize(scored[col].astype(str))
+            sums = np.stack([
+                np.bincount(codes, minlength=len(values)).astype(np.float64),
+                np.bincount(codes, weights=exposure, minlength=len(values)),
+                np.bincount(codes, weights=probability, minlength=len(values)),
+                np.bincount(codes, weights=expected_loss, minlength=len(values)),
+            ], axis=1)
+            totals = self._segments[col]
+            for value, row in zip(values, sums):
+                if value in totals:
+                    totals[value] += row
+                else:
+                    totals[value] = row
+
+    def track(self, chunks):
+        """Pass scored chunks through unchanged, adding each to the summary on the way."""
+        for scored in chunks:
+            self.update(scored)
+            yield scored
+
+    def ratings(self) -> pd.DataFrame:
+        counts = pd.Series(self._ratings, name='applicants')
+        counts = counts[(counts > 0) | counts.index.isin(RATING_CATEGORIES[:-1])]
+        return pd.DataFrame({'applicants': counts, 'share': counts / max(self.rows, 1)}).rename_axis('rating')
+
+    def score_histogram(self) -> pd.DataFrame:
+        lower = _SCORE_MIN + np.arange(len(self._scores)) * self.score_bin
+        return pd.DataFrame({'score_from': lower, 'score_to': lower + self.score_bin, 'applicants': self._scores})
+
+    def probability_percentiles(self, percentiles=PERCENTILES) -> pd.Series:
+        """Default-probability percentiles, interpolated within histogram bins."""
+        if self.rows == 0:
+            return pd.Series(np.nan, index=[f'p{q}' for q in percentiles], name='default_probability')
+        cumulative = np.cumsum(self._probabilities)
+        values = []
+        for q in percentiles:
+            rank = q / 100 * self.rows
+            i = int(np.searchsorted(cumulative, rank))
+            i = min(i, _PROBABILITY_BINS - 1)
+            before = cumulative[i - 1] if i else 0
+            within = (rank - before) / self._probabilities[i] if self._probabilities[i] else 0.0
+            values.append((i + within) / _PROBABILITY_BINS)
+        return pd.Series(values, index=[f'p{q}' for q in percentiles], name='default_probability')
+
+    def segments(self, column: str) -> pd.DataFrame:
+        """Applicants, exposure, mean default probability and expected loss per value of column."""
+        totals = self._segments[column]
+        table = pd.DataFrame.from_dict(totals, orient='index',
+                                       columns=['applicants', 'exposure', 'sum_probability', 'expected_loss'])
+        table['applicants'] = table['applicants'].astype(np.int64)
+        table['mean_default_probability'] = table.pop('sum_probability') / table['applicants']
+        table['expected_loss_rate'] = table['expected_loss'] / table['exposure'].where(table['exposure'] > 0)
+        return table.rename_axis(column).sort_values('expected_loss', ascending=False)
+
+    def totals(self) -> dict:
+        # Every row lands in exactly one value of each segment column, so any column gives the totals
+        _, exposure, sum_probability, expected_loss = sum(self._segments[SEGMENT_COLUMNS[0]].values(), np.zeros(4))
+        return {
+            'applicants': self.rows,
+            'exposure': float(exposure),
+            'expected_loss': float(expected_loss),
+            'mean_default_probability': float(sum_probability / self.rows) if self.rows else 0.0,
+            'lgd': self.lgd,
+        }
+
+    def to_dict(self) -> dict:
+        """JSON-friendly snapshot of every aggregate."""
+        return {
+            'totals': self.totals(),
+            'ratings': self.ratings()['applicants'].to_dict(),
+            'score_histogram': self.score_histogram().to_dict('records'),
+            'default_probability_percentiles': self.probability_percentiles().to_dict(),
+            'segments': {col: self.segments(col).reset_index().to_dict('records') for col in SEGMENT_COLUMNS},
+        }
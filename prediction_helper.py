@@ -1,22 +1,298 @@
-import joblib
+import functools
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
+
+import disk_cache
+from affordability import DEFAULT_DTI_PCT, DEFAULT_INTEREST_PA, affordability_columns
+from encoding import CategoricalEncoder, distinct_codes
+from instrumentation import metrics, perf_counter
+from lite_inference import (CATEGORICAL_INPUT_COLUMNS, CATEGORY_DOMAINS, INT_INPUT_COLUMNS, RAW_INPUT_COLUMNS,
+                            RAW_INPUT_DEFAULTS, RATING_CATEGORIES, gather_scaling, get_rating, int_column,
+                            linear_scores, rating_codes, scale_features, top_contributions)
+from model_artifact import is_compact_artifact, load_artifact
 
 # Path to the saved model and its components
 MODEL_PATH = 'artifacts/model_data.joblib'
 
-# Load the model and its components
-model_data = joblib.load(MODEL_PATH)
-model = model_data['model']
-scaler = model_data['scaler']
-features = model_data['features']
-cols_to_scale = model_data['cols_to_scale']
+
+class LinearScorer:
+    """Single-applicant scoring kernel compiled once from the model components.
+
+    The scaler's scale_/min_ are gathered into feature order at build time
+    (lite_inference.gather_scaling, shared with LiteScorer and prepare_batch_input), so a call
+    writes the raw feature values into a preallocated row, applies that affine step in place and
+    takes one dot product against model.coef_. One-hot values come from the bundle's
+    CategoricalEncoder, so levels and unknown-category counts match the batch path. The
+    arithmetic is the same as prepare_input followed by calculate_credit_score, so results are
+    bit-identical, without building any DataFrames.
+    """
+
+    # Order in which score() writes numeric feature values; mapped onto model feature positions at build time
+    RAW_FEATURES = ('age', 'loan_tenure_months', 'number_of_open_accounts', 'credit_utilization_ratio',
+                    'loan_to_income', 'delinquency_ratio', 'avg_dpd_per_delinquency')
+
+    def __init__(self, model, scaler, features, cols_to_scale, encoder, base_score=300, scale_length=600):
+        features = list(features)
+        onehot = {f for col in CATEGORICAL_INPUT_COLUMNS for f in encoder.features[col]}
+        missing = [f for f in features if f not in self.RAW_FEATURES and f not in onehot]
+        if missing:
+            raise ValueError(f"LinearScorer cannot build model features: {missing}")
+
+        self.scale, self.offset, self.clip = gather_scaling(features, cols_to_scale, scaler)
+
+        # Raw values for features the model does not use are written to a spare trailing slot
+        self._positions = np.array([features.index(f) if f in features else len(features)
+                                    for f in self.RAW_FEATURES])
+        self._onehot_positions = {col: np.array([features.index(f) for f in encoder.features[col]],
+                                                dtype=np.intp)
+                                  for col in CATEGORICAL_INPUT_COLUMNS}
+        self.encoder = encoder
+        self.coef_t = np.ascontiguousarray(model.coef_.T)
+        self.intercept = model.intercept_
+        self.base_score = base_score
+        self.scale_length = scale_length
+        self._n_features = len(features)
+        self._local = threading.local()
+
+    def _row(self):
+        # One preallocated buffer per thread: Streamlit sessions score concurrently
+        buf = getattr(self._local, 'buf', None)
+        if buf is None:
+            buf = self._local.buf = np.zeros((1, self._n_features + 1))
+        return buf
+
+    def score(self, age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
+              delinquency_ratio, credit_utilization_ratio, num_open_accounts,
+              residence_type, loan_purpose, loan_type):
+        """Return (default_probability, credit_score, rating) for one applicant."""
+        timed = metrics.enabled
+        if timed:
+            t0 = perf_counter()
+        buf = self._row()
+        buf[0, self._positions] = (
+            age,
+            loan_tenure_months,
+            num_open_accounts,
+            credit_utilization_ratio,
+            loan_amount / income if income > 0 else 0,
+            delinquency_ratio,
+            avg_dpd_per_delinquency,
+        )
+        for col, value in zip(CATEGORICAL_INPUT_COLUMNS, (residence_type, loan_purpose, loan_type)):
+            buf[0, self._onehot_positions[col]] = self.encoder.onehot(col, value)
+        if timed:
+            t1 = perf_counter()
+        row = scale_features(buf[:, :self._n_features], self.scale, self.offset, self.clip)
+        if timed:
+            t2 = perf_counter()
+
+        x = np.dot(row, self.coef_t) + self.intercept
+        default_probability = 1 / (1 + np.exp(-x))
+        credit_score = self.base_score + (1 - default_probability).flatten() * self.scale_length
+        if timed:
+            t3 = perf_counter()
+        result = default_probability.flatten()[0], int(credit_score[0]), get_rating(credit_score[0])
+        if timed:
+            metrics.record('predict', [('prepare', t1 - t0), ('scale', t2 - t1), ('dot', t3 - t2),
+                                       ('rating', perf_counter() - t3)])
+        return result
+
+
+def model_fingerprint(bundle) -> str:
+    """SHA-256 of everything that determines scores: column lists, coefficients and scaler parameters.
+    The joblib and compact artifacts of the same model share a fingerprint.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps([list(map(str, bundle.features)), list(map(str, bundle.cols_to_scale))]).encode())
+    for values in (bundle.model.coef_, bundle.model.intercept_, bundle.scaler.scale_, bundle.scaler.min_):
+        h.update(np.ascontiguousarray(values, dtype='<f8').tobytes())
+    h.update(repr((bool(getattr(bundle.scaler, 'clip', False)), tuple(map(float, bundle.scaler.feature_range)))).encode())
+    return h.hexdigest()
+
+
+class ModelBundle:
+    """The loaded model artifact: model, scaler, feature lists, the compiled LinearScorer and
+    CategoricalEncoder, and its fingerprint.
+    """
+
+    def __init__(self, model_data: dict):
+        self.model_data = model_data
+        self.model = model_data['model']
+        self.scaler = model_data['scaler']
+        # Compact artifacts store plain lists; keep the object-dtype Index the joblib artifact has
+        self.features = pd.Index(model_data['features'], dtype=object)
+        self.cols_to_scale = pd.Index(model_data['cols_to_scale'], dtype=object)
+        self.encoder = CategoricalEncoder(self.features)
+        self.scorer = LinearScorer(self.model, self.scaler, self.features, self.cols_to_scale, self.encoder)
+        self.fingerprint = model_fingerprint(self)
+
+
+class ModelRegistry:
+    """Loads the model artifact on first use and memoizes it until reload() or swap() replaces it.
+
+    Importing this module no longer deserializes the artifact (or imports scikit-learn);
+    the first scoring call does, once, under a lock. path may be the joblib artifact or a
+    compact one written by model_artifact.export_artifact; the format is detected from the file.
+    Scoring functions fetch the bundle once per call, so a swap never mixes two models in one result.
+    """
+
+    def __init__(self, path: str = MODEL_PATH):
+        self.path = path
+        self._bundle = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ModelBundle:
+        bundle = self._bundle
+        if bundle is None:
+            with self._lock:
+                if self._bundle is None:
+                    self._bundle = self._load()
+                bundle = self._bundle
+        return bundle
+
+    def reload(self) -> ModelBundle:
+        """Load and validate the artifact again from disk, then make it the current bundle."""
+        return self.swap(self.load_candidate())
+
+    def load_candidate(self) -> ModelBundle:
+        """Load and validate the artifact without making it current (see validate_bundle)."""
+        bundle = self._load()
+        validate_bundle(bundle)
+        return bundle
+
+    def swap(self, bundle: ModelBundle) -> ModelBundle:
+        """Make bundle current. Calls already running keep the bundle they started with."""
+        with self._lock:
+            self._bundle = bundle
+        return bundle
+
+    @property
+    def loaded(self) -> bool:
+        return self._bundle is not None
+
+    def _load(self) -> ModelBundle:
+        if is_compact_artifact(self.path):
+            return ModelBundle(load_artifact(self.path))
+        import joblib  # deferred: unpickling pulls in scikit-learn
+
+        return ModelBundle(joblib.load(self.path))
+
+
+def validate_bundle(bundle: ModelBundle):
+    """Raise ValueError unless bundle's arrays agree in shape and it scores a probe batch to finite values.
+    Scoring the probe also warms the new bundle up before it takes traffic.
+    """
+    n_features, n_scaled = len(bundle.features), len(bundle.cols_to_scale)
+    if np.shape(bundle.model.coef_) != (1, n_features) or np.size(bundle.model.intercept_) != 1:
+        raise ValueError(f"model expects coef_ of shape (1, {n_features}), got {np.shape(bundle.model.coef_)}")
+    if np.size(bundle.scaler.scale_) != n_scaled or np.size(bundle.scaler.min_) != n_scaled:
+        raise ValueError(f"scaler parameters do not match the {n_scaled} columns to scale")
+    probe = predict_batch(batch_template(), bundle=bundle)
+    bundle.scorer.score(*normalize_inputs(**batch_template().iloc[0]))
+    if not np.isfinite(probe['default_probability'].to_numpy(dtype=np.float64)).all():
+        raise ValueError("model produces non-finite default probabilities")
+
+
+# SAFELEND_MODEL may point at a compact artifact (see model_artifact.py) instead of the joblib file
+registry = ModelRegistry(os.environ.get('SAFELEND_MODEL', MODEL_PATH))
+
+_BUNDLE_ATTRS = ('model_data', 'model', 'scaler', 'features', 'cols_to_scale', 'scorer')
+
+
+def __getattr__(name):
+    # Module-level model, scaler, features, ... resolve lazily through the registry
+    if name in _BUNDLE_ATTRS:
+        return getattr(registry.get(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class ScoreCache:
+    """Bounded LRU cache for single-applicant scoring results, with hit/miss counters.
+
+    Entries are tied to the ModelBundle they were computed with; when the registry hands out a
+    different bundle (the artifact was reloaded), the cache empties itself on the next lookup.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._bundle = None
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, bundle, compute):
+        with self._lock:
+            if bundle is not self._bundle:
+                self._data.clear()
+                self._bundle = bundle
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            if bundle is self._bundle and self.maxsize > 0:
+                self._data[key] = value
+                if len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+score_cache = ScoreCache()
+
+# Optional second level shared across processes and restarts (SAFELEND_SCORE_CACHE, see disk_cache.py)
+persistent_cache = disk_cache.from_environment()
+
+
+def metrics_snapshot() -> dict:
+    """Per-stage timings (empty unless instrumentation is enabled), cache counters and unknown categories seen."""
+    return {'enabled': metrics.enabled, 'stages': metrics.snapshot(), 'score_cache': score_cache.stats(),
+            'persistent_cache': persistent_cache.stats() if persistent_cache is not None else None,
+            'unknown_categories': registry.get().encoder.unknown_summary() if registry.loaded else {}}
+
+
+def normalize_inputs(age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
+                     delinquency_ratio, credit_utilization_ratio, num_open_accounts,
+                     residence_type, loan_purpose, loan_type) -> tuple:
+    """Canonical 11-field tuple for the raw inputs: numerics as float, categoricals as str.
+    Inputs that normalize to the same tuple always score the same.
+    """
+    return (float(age), float(income), float(loan_amount), float(loan_tenure_months),
+            float(avg_dpd_per_delinquency), float(delinquency_ratio), float(credit_utilization_ratio),
+            float(num_open_accounts), str(residence_type), str(loan_purpose), str(loan_type))
 
 
 def prepare_input(age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
                     delinquency_ratio, credit_utilization_ratio, num_open_accounts, residence_type,
-                    loan_purpose, loan_type):
+                    loan_purpose, loan_type, bundle=None):
+    bundle = bundle or registry.get()
+
     # Create a dictionary with input values and dummy values for missing features
     input_data = {
         'age': age,
@@ -26,12 +302,9 @@ def prepare_input(age, income, loan_amount, loan_tenure_months, avg_dpd_per_deli
         'loan_to_income': loan_amount / income if income > 0 else 0,
         'delinquency_ratio': delinquency_ratio,
         'avg_dpd_per_delinquency': avg_dpd_per_delinquency,
-        'residence_type_Owned': 1 if residence_type == 'Owned' else 0,
-        'residence_type_Rented': 1 if residence_type == 'Rented' else 0,
-        'loan_purpose_Education': 1 if loan_purpose == 'Education' else 0,
-        'loan_purpose_Home': 1 if loan_purpose == 'Home' else 0,
-        'loan_purpose_Personal': 1 if loan_purpose == 'Personal' else 0,
-        'loan_type_Unsecured': 1 if loan_type == 'Unsecured' else 0,
+        # one-hot columns from the bundle's encoder, which records unknown categories
+        **bundle.encoder.encode_one({'residence_type': residence_type, 'loan_purpose': loan_purpose,
+                                     'loan_type': loan_type}),
         # additional dummy fields just for scaling purpose
         'number_of_dependants': 1,  # Dummy value
         'years_at_current_address': 1,  # Dummy value
@@ -50,10 +323,10 @@ def prepare_input(age, income, loan_amount, loan_tenure_months, avg_dpd_per_deli
     df = pd.DataFrame([input_data])
 
     # Ensure only required columns for scaling are scaled
-    df[cols_to_scale] = scaler.transform(df[cols_to_scale])
+    df[bundle.cols_to_scale] = bundle.scaler.transform(df[bundle.cols_to_scale])
 
     # Ensure the DataFrame contains only the features expected by the model
-    df = df[features]
+    df = df[bundle.features]
 
     return df
 
@@ -61,17 +334,18 @@ def prepare_input(age, income, loan_amount, loan_tenure_months, avg_dpd_per_deli
 def predict(age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
             delinquency_ratio, credit_utilization_ratio, num_open_accounts,
             residence_type, loan_purpose, loan_type):
-    # Prepare input data
-    input_df = prepare_input(age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
-                             delinquency_ratio, credit_utilization_ratio, num_open_accounts, residence_type,
-                             loan_purpose, loan_type)
+    bundle = registry.get()
+    inputs = normalize_inputs(age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
+                              delinquency_ratio, credit_utilization_ratio, num_open_accounts,
+                              residence_type, loan_purpose, loan_type)
+    compute = functools.partial(bundle.scorer.score, *inputs)
+    if persistent_cache is not None:
+        compute = functools.partial(persistent_cache.get_or_compute, bundle.fingerprint, inputs, compute)
+    return score_cache.get_or_compute(('predict', inputs), bundle, compute)
 
-    probability, credit_score, rating = calculate_credit_score(input_df)
 
-    return probability, credit_score, rating
-
-
-def calculate_credit_score(input_df, base_score=300, scale_length=600):
+def calculate_credit_score(input_df, base_score=300, scale_length=600, bundle=None):
+    model = (bundle or registry.get()).model
     x = np.dot(input_df.values, model.coef_.T) + model.intercept_
 
     # Apply the logistic function to calculate the probability
@@ -83,33 +357,22 @@ def calculate_credit_score(input_df, base_score=300, scale_length=600):
     credit_score = base_score + non_default_probability.flatten() * scale_length
 
     # Determine the rating category based on the credit score
-    def get_rating(score):
-        if 300 <= score < 500:
-            return 'Poor'
-        elif 500 <= score < 650:
-            return 'Average'
-        elif 650 <= score < 750:
-            return 'Good'
-        elif 750 <= score <= 900:
-            return 'Excellent'
-        else:
-            return 'Undefined'  # in case of any unexpected score
-
     rating = get_rating(credit_score[0])
 
     return default_probability.flatten()[0], int(credit_score[0]), rating
 
 
 # Explainability utilities
-def get_feature_contributions(input_df: pd.DataFrame) -> pd.DataFrame:
+def get_feature_contributions(input_df: pd.DataFrame, bundle=None) -> pd.DataFrame:
     """Return per-feature linear contributions: value * coefficient.
     Output columns: feature, value, coefficient, contribution.
     """
-    coefs = model.coef_.flatten()
+    bundle = bundle or registry.get()
+    coefs = bundle.model.coef_.flatten()
     vals = input_df.iloc[0].values.flatten()
     contribs = vals * coefs
     df = pd.DataFrame({
-        'feature': features,
+        'feature': bundle.features,
         'value': vals,
         'coefficient': coefs,
         'contribution': contribs
@@ -118,26 +381,236 @@ def get_feature_contributions(input_df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def top_reasons(contrib_df: pd.DataFrame, top_k: int) -> pd.DataFrame:
+    """The first top_k rows of a get_feature_contributions breakdown as reason codes.
+    Rows whose contribution is not positive are blanked (None/NaN), as in predict_batch's reasons.
+    """
+    top = contrib_df.head(top_k).copy()
+    blank = ~(top['contribution'] > 0)
+    top['feature'] = top['feature'].astype(object).where(~blank, None)
+    top.loc[blank, ['value', 'coefficient', 'contribution']] = np.nan
+    return top
+
+
 def explain_from_inputs(age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
                         delinquency_ratio, credit_utilization_ratio, num_open_accounts,
                         residence_type, loan_purpose, loan_type):
     """Return prediction plus feature contribution breakdown."""
-    input_df = prepare_input(age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
-                             delinquency_ratio, credit_utilization_ratio, num_open_accounts, residence_type,
-                             loan_purpose, loan_type)
-    probability, credit_score, rating = calculate_credit_score(input_df)
-    contrib_df = get_feature_contributions(input_df)
-    return probability, credit_score, rating, contrib_df
+    bundle = registry.get()  # one bundle for the whole call, even if the model is swapped meanwhile
+    inputs = normalize_inputs(age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
+                              delinquency_ratio, credit_utilization_ratio, num_open_accounts,
+                              residence_type, loan_purpose, loan_type)
 
+    def explain():
+        timed = metrics.enabled
+        if timed:
+            t0 = perf_counter()
+        input_df = prepare_input(*inputs, bundle=bundle)
+        if timed:
+            t1 = perf_counter()
+        probability, credit_score, rating = calculate_credit_score(input_df, bundle=bundle)
+        if timed:
+            t2 = perf_counter()
+        contrib_df = get_feature_contributions(input_df, bundle)
+        if timed:
+            metrics.record('explain', [('prepare', t1 - t0), ('score', t2 - t1),
+                                       ('contributions', perf_counter() - t2)])
+        return probability, credit_score, rating, contrib_df
 
-def predict_batch(raw_df: pd.DataFrame) -> pd.DataFrame:
+    probability, credit_score, rating, contrib_df = score_cache.get_or_compute(
+        ('explain', inputs), bundle, explain)
+    # Callers may modify the breakdown; keep the cached copy intact
+    return probability, credit_score, rating, contrib_df.copy()
+
+
+def categorical_column(values: pd.Series, domain: tuple) -> pd.Categorical:
+    """values as a Categorical over domain followed by any other values present (in order of appearance).
+    One lookup per distinct value; no Python string is created per row. Missing values stay missing.
+    """
+    levels = list(domain)
+    positions = {level: i for i, level in enumerate(levels)}
+
+    def position(value):
+        if value not in positions:
+            positions[value] = len(levels)
+            levels.append(value)
+        return positions[value]
+
+    codes = distinct_codes(values, position)
+    return pd.Categorical.from_codes(codes, categories=levels)
+
+
+def coerce_batch_inputs(raw_df: pd.DataFrame) -> pd.DataFrame:
+    """Column-wise version of the int()/float() coercion applied to each uploaded row.
+    Numbers become int64/float64 arrays and the categorical inputs Categoricals (see categorical_column).
+    Missing columns are filled with RAW_INPUT_DEFAULTS; the result has a fresh RangeIndex.
+    Raises ValueError for a NaN or infinite age, tenure or open-accounts value, as int() does per row.
+    """
+    n = len(raw_df)
+    columns = {}
+    for col, default in RAW_INPUT_DEFAULTS.items():
+        if col in CATEGORICAL_INPUT_COLUMNS:
+            domain = CATEGORY_DOMAINS[col]
+            if col in raw_df.columns:
+                columns[col] = categorical_column(raw_df[col], domain)
+            else:
+                columns[col] = pd.Categorical.from_codes(np.full(n, domain.index(default)), categories=domain)
+            continue
+        values = raw_df[col].to_numpy() if col in raw_df.columns else np.full(n, default)
+        # astype copies, so the frame owns its arrays and can take them without another copy
+        columns[col] = int_column(values) if col in INT_INPUT_COLUMNS else values.astype(np.float64)
+    return pd.DataFrame(columns, copy=False)
+
+
+def prepare_batch_input(inputs: pd.DataFrame, stages: list = None, bundle=None) -> pd.DataFrame:
+    """Vectorized prepare_input for a frame of coerced raw inputs (see coerce_batch_inputs).
+
+    The model features are written straight into one (rows x features) float64 matrix and scaled in
+    place with the scaler parameters LinearScorer gathers into feature order: the same arithmetic
+    as scaler.transform, without the intermediate frame or its dummy columns. The returned frame
+    wraps that matrix without copying it. If stages is a list, ('prepare', s) and ('scale', s)
+    timings are appended to it.
+    """
+    if stages is not None:
+        t0 = perf_counter()
+    income = inputs['income'].to_numpy()
+    loan_amount = inputs['loan_amount'].to_numpy()
+    loan_to_income = np.zeros(len(inputs))
+    np.divide(loan_amount, income, out=loan_to_income, where=income > 0)
+
+    bundle = bundle or registry.get()
+    input_data = {
+        'age': inputs['age'].to_numpy(),
+        'loan_tenure_months': inputs['loan_tenure_months'].to_numpy(),
+        'number_of_open_accounts': inputs['num_open_accounts'].to_numpy(),
+        'credit_utilization_ratio': inputs['credit_utilization_ratio'].to_numpy(),
+        'loan_to_income': loan_to_income,
+        'delinquency_ratio': inputs['delinquency_ratio'].to_numpy(),
+        'avg_dpd_per_delinquency': inputs['avg_dpd_per_delinquency'].to_numpy(),
+        # one-hot columns from the bundle's lookup tables (see encoding.py)
+        **bundle.encoder.encode(inputs),
+    }
+    X = np.empty((len(inputs), len(bundle.features)))
+    for j, feature in enumerate(bundle.features):
+        X[:, j] = input_data[feature]
+    del input_data
+    if stages is not None:
+        t1 = perf_counter()
+    scale_features(X, bundle.scorer.scale, bundle.scorer.offset, bundle.scorer.clip)
+    if stages is not None:
+        stages += [('prepare', t1 - t0), ('scale', perf_counter() - t1)]
+    return pd.DataFrame(X, columns=bundle.features, index=inputs.index, copy=False)
+
+
+def calculate_credit_scores(input_df, base_score=300, scale_length=600, stages: list = None, bundle=None):
+    """Batch counterpart of calculate_credit_score.
+    Returns (default_probability, credit_score, rating), one entry per row of input_df: float64 and
+    int64 arrays, and a Categorical over RATING_CATEGORIES.
+    If stages is a list, ('dot', s) and ('rating', s) timings are appended to it.
+    """
+    if stages is not None:
+        t0 = perf_counter()
+    scorer = (bundle or registry.get()).scorer
+    values = np.ascontiguousarray(input_df.to_numpy(dtype=np.float64))
+    default_probability, credit_score = linear_scores(values, scorer.coef_t, scorer.intercept, base_score,
+                                                      scale_length)
+    if stages is not None:
+        t1 = perf_counter()
+
+    rating = pd.Categorical.from_codes(rating_codes(credit_score), categories=RATING_CATEGORIES)
+    if stages is not None:
+        stages += [('dot', t1 - t0), ('rating', perf_counter() - t1)]
+    return default_probability, credit_score.astype(np.int64), rating
+
+
+def top_feature_contributions(input_df: pd.DataFrame, top_k: int = 3, bundle=None):
+    """Batch counterpart of get_feature_contributions, reduced to the top_k features per row.
+
+    Computed by lite_inference.top_contributions, the kernel LiteScorer uses.
+    Returns (feature names, contributions), both shaped (rows, top_k), largest contribution first.
+    """
+    bundle = bundle or registry.get()
+    return top_contributions(input_df.to_numpy(dtype=np.float64), bundle.model.coef_, bundle.features, top_k)
+
+
+def reason_columns(top_k: int) -> list:
+    """Output columns added by predict_batch(explain=True)."""
+    return [col for i in range(1, top_k + 1) for col in (f'reason_{i}', f'reason_{i}_contribution')]
+
+
+AFFORDABILITY_COLUMNS = ['emi', 'max_affordable_loan', 'affordability_gap']
+
+
+def predict_batch(raw_df: pd.DataFrame, explain: bool = False, top_k: int = 3, affordability: bool = False,
+                  interest_pa: float = DEFAULT_INTEREST_PA, dti_pct: float = DEFAULT_DTI_PCT,
+                  bundle=None) -> pd.DataFrame:
     """Batch scoring for a DataFrame with columns matching the app's raw inputs:
     [age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
      delinquency_ratio, credit_utilization_ratio, num_open_accounts,
      residence_type, loan_purpose, loan_type]
 
     Returns a DataFrame with the original inputs plus: default_probability, credit_score, rating, loan_to_income.
+    Numbers are int64/float64 columns; the categorical inputs and rating are Categoricals, so a
+    million rows hold codes rather than millions of Python strings.
+    Scores the whole frame in one pass; results match predict_batch_rowwise exactly.
+    With explain=True, also adds reason_1..reason_{top_k} (the features pushing default risk up
+    the most) and their contributions, see top_feature_contributions; slots without a positive
+    contribution are None/NaN.
+    With affordability=True, also adds emi, max_affordable_loan and affordability_gap for each
+    applicant's loan and tenure at interest_pa and dti_pct (see affordability.affordability_columns).
+    The whole batch is scored with one ModelBundle: bundle if given, else the registry's current one.
+    """
+    bundle = bundle or registry.get()
+    stages = [] if metrics.enabled else None
+    if stages is not None:
+        t0 = perf_counter()
+    out = coerce_batch_inputs(raw_df)
+    if stages is not None:
+        stages.append(('coerce', perf_counter() - t0))
+    if out.empty:
+        return pd.DataFrame(columns=RAW_INPUT_COLUMNS + ['loan_to_income', 'default_probability',
+                                                         'credit_score', 'rating']
+                                    + (reason_columns(top_k) if explain else [])
+                                    + (AFFORDABILITY_COLUMNS if affordability else []))
+
+    input_df = prepare_batch_input(out, stages, bundle)
+    probability, credit_score, rating = calculate_credit_scores(input_df, stages=stages, bundle=bundle)
+
+    income = out['income'].to_numpy()
+    loan_to_income = np.zeros(len(out))
+    np.divide(out['loan_amount'].to_numpy(), income, out=loan_to_income, where=income != 0)
+
+    out['loan_to_income'] = loan_to_income
+    out['default_probability'] = probability
+    out['credit_score'] = credit_score
+    out['rating'] = rating
+
+    if explain:
+        if stages is not None:
+            t1 = perf_counter()
+        names, contribs = top_feature_contributions(input_df, top_k, bundle)
+        for i in range(names.shape[1]):
+            out[f'reason_{i + 1}'] = names[:, i]
+            out[f'reason_{i + 1}_contribution'] = contribs[:, i]
+        if stages is not None:
+            stages.append(('explain', perf_counter() - t1))
+    if affordability:
+        if stages is not None:
+            t1 = perf_counter()
+        out = out.assign(**affordability_columns(income, out['loan_amount'].to_numpy(),
+                                                 out['loan_tenure_months'].to_numpy(), interest_pa, dti_pct))
+        if stages is not None:
+            stages.append(('affordability', perf_counter() - t1))
+    if stages is not None:
+        metrics.record('batch', stages, rows=len(out))
+    return out
+
+
+def predict_batch_rowwise(raw_df: pd.DataFrame) -> pd.DataFrame:
+    """Row-by-row reference implementation of predict_batch (one prepare_input call per row).
+    Kept for equivalence checks and benchmarks; use predict_batch for real workloads.
     """
+    bundle = registry.get()
     outputs = []
     for _, row in raw_df.iterrows():
         age = int(row.get('age', 0))
@@ -154,8 +627,8 @@ def predict_batch(raw_df: pd.DataFrame) -> pd.DataFrame:
 
         inp = prepare_input(age, income, loan_amount, loan_tenure_months, avg_dpd_per_delinquency,
                             delinquency_ratio, credit_utilization_ratio, num_open_accounts, residence_type,
-                            loan_purpose, loan_type)
-        prob, score, rating = calculate_credit_score(inp)
+                            loan_purpose, loan_type, bundle)
+        prob, score, rating = calculate_credit_score(inp, bundle=bundle)
         outputs.append({
             'age': age,
             'income': income,
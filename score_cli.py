@@ -0,0 +1,111 @@
+"""Command-line batch scorer for scheduled jobs.
+
+    python score_cli.py applicants.csv scored.parquet --chunk-size 100000 --workers 4 --explain
+
+Reads and writes CSV, Parquet, Feather or Arrow IPC (from the file extensions unless --input-format /
+--output-format are given), and prints rows/sec and peak memory when done. Only the scoring
+stack is imported, never streamlit or plotly.
+"""
+import argparse
+import json
+import sys
+import time
+
+# Mirrors batch_scoring.FORMATS; not imported from there to keep --help free of pandas
+FORMATS = ('csv', 'parquet', 'feather', 'arrow')
+
+
+def peak_memory_mb(children: bool = False):
+    """Peak resident set size of this process, or with children of the largest reaped worker process
+    (the kernel keeps only the maximum, not a sum). None if unavailable.
+    """
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='score_cli', description="Score a file of loan applicants with the SafeLend model.")
+    parser.add_argument('input', help="CSV, Parquet, Feather or Arrow file of raw applicant inputs")
+    parser.add_argument('output', help="destination file for scored rows")
+    parser.add_argument('--chunk-size', type=int, default=50_000, help="rows read and scored at a time (default: 50000)")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes; 0 uses every CPU (default: 1)")
+    parser.add_argument('--explain', action=argparse.BooleanOptionalAction, default=False,
+                        help="add top reason codes per applicant (default: off)")
+    parser.add_argument('--top-k', type=int, default=3, help="reason codes per applicant with --explain (default: 3)")
+    parser.add_argument('--affordability', action=argparse.BooleanOptionalAction, default=False,
+                        help="add EMI, max affordable loan and gap at 12%% p.a. and 35%% DTI (default: off)")
+    parser.add_argument('--summary', metavar='JSON', help="also write a portfolio summary (ratings, score histogram, "
+                                                          "percentiles, expected loss by segment) to this file")
+    parser.add_argument('--rejects', metavar='CSV', help="validate inputs first; write invalid rows with their "
+                                                         "reasons here and score only the valid ones")
+    parser.add_argument('--incremental', metavar='DIR', help="reuse scores stored in DIR for unchanged applicants and "
+                                                             "store this run's scores there (not with --explain, "
+                                                             "--affordability or several workers)")
+    parser.add_argument('--input-format', choices=FORMATS, help="default: from the input extension")
+    parser.add_argument('--output-format', choices=FORMATS, help="default: from the output extension")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.incremental and (args.explain or args.affordability or args.workers != 1 or args.rejects):
+        parser.error("--incremental scores in one process without --explain, --affordability or --rejects")
+
+    # Imported after argument parsing so --help and usage errors stay instant
+    from batch_scoring import score_file
+    from incremental import score_file_incremental
+    from portfolio import PortfolioSummary
+    from prediction_helper import registry
+    from validation import RejectLog
+
+    summary = PortfolioSummary() if args.summary else None
+    rejects = RejectLog(args.rejects) if args.rejects else None
+    start = time.perf_counter()
+    try:
+        registry.get()
+        load_s = time.perf_counter() - start
+        start = time.perf_counter()
+        if args.incremental:
+            stats = score_file_incremental(args.input, args.output, args.incremental, chunk_size=args.chunk_size,
+                                           input_format=args.input_format, output_format=args.output_format,
+                                           summary=summary)
+        else:
+            stats = score_file(args.input, args.output, chunk_size=args.chunk_size, workers=args.workers or None,
+                               explain=args.explain, top_k=args.top_k, affordability=args.affordability,
+                               input_format=args.input_format, output_format=args.output_format, summary=summary,
+                               rejects=rejects)
+        if summary is not None:
+            with open(args.summary, 'w') as f:
+                json.dump(summary.to_dict(), f, indent=2)
+    except (OSError, ImportError, ValueError) as e:
+        print(f"score_cli: error: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+
+    peak = peak_memory_mb()
+    worker_peak = peak_memory_mb(children=True) if args.workers != 1 else None
+    print(f"scored {stats['rows']:,} rows in {stats['chunks']:,} chunk(s) -> {args.output}")
+    if rejects is not None:
+        print(f"rejected {stats['rejected']:,} of {rejects.rows:,} rows -> {args.rejects}")
+    if args.incremental:
+        print(f"incremental: {stats['reused']:,} reused from {args.incremental}, {stats['scored']:,} scored")
+    if summary is not None:
+        totals = summary.totals()
+        print(f"portfolio summary -> {args.summary}: mean default probability "
+              f"{totals['mean_default_probability']:.1%}, expected loss {totals['expected_loss']:,.0f}")
+    print(f"model load {load_s:.2f} s, scoring {elapsed:.2f} s, {stats['rows'] / elapsed if elapsed else 0:,.0f} rows/sec")
+    if peak is None:
+        print("peak memory n/a on this platform")
+    else:
+        print(f"peak memory {peak:,.1f} MB" + (f", largest worker {worker_peak:,.1f} MB" if worker_peak else ""))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
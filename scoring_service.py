@@ -0,0 +1,320 @@
+"""Local HTTP JSON scoring service built on prediction_helper.
+
+Concurrent /score requests are collected for up to --max-wait-ms (or until --max-batch applicants
+are queued) and scored together with one vectorized predict_batch call. Only the standard
+library is used on top of the scoring stack.
+
+    python scoring_service.py --port 8000
+    python scoring_service.py --challenger v2=artifacts/model_v2.slm   # shadow-score with a second model
+
+Endpoints:
+    POST /score    one applicant object, or a list of them -> probability, credit score, rating
+    POST /explain  one applicant object -> score plus per-feature contributions (explain_from_inputs)
+    GET  /metrics  request/row counters, batch sizes, p50/p99 latency and throughput (plus shadow stats)
+    GET  /health   liveness and whether the model is loaded
+"""
+import argparse
+import asyncio
+import collections
+import json
+import logging
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from prediction_helper import CATEGORICAL_INPUT_COLUMNS, RAW_INPUT_COLUMNS, explain_from_inputs, predict_batch, registry
+from shadow import ShadowScorer, parse_challengers
+
+MAX_BODY_BYTES = 1 << 20
+INT64_RANGE = (-(1 << 63), (1 << 63) - 1)
+LATENCY_WINDOW = 10_000
+
+
+class BadRequest(Exception):
+    pass
+
+
+def parse_applicant(record) -> dict:
+    """Check one JSON applicant has all raw input fields with usable types and finite, int64-sized numbers."""
+    if not isinstance(record, dict):
+        raise BadRequest("each applicant must be a JSON object")
+    missing = [col for col in RAW_INPUT_COLUMNS if col not in record]
+    if missing:
+        raise BadRequest(f"missing fields: {', '.join(missing)}")
+    applicant = {}
+    for col in RAW_INPUT_COLUMNS:
+        value = record[col]
+        if col in CATEGORICAL_INPUT_COLUMNS:
+            if not isinstance(value, str):
+                raise BadRequest(f"{col} must be a string")
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise BadRequest(f"{col} must be a number")
+        elif isinstance(value, float) and not math.isfinite(value):  # json.loads accepts NaN and Infinity
+            raise BadRequest(f"{col} must be a finite number")
+        elif not INT64_RANGE[0] <= value <= INT64_RANGE[1]:
+            raise BadRequest(f"{col} is out of range")
+        applicant[col] = value
+    return applicant
+
+
+def _result(row) -> dict:
+    return {
+        'default_probability': float(row['default_probability']),
+        'credit_score': int(row['credit_score']),
+        'rating': str(row['rating']),
+    }
+
+
+def score_records(records: list, score=predict_batch) -> list:
+    """Score parsed applicants in one predict_batch call; returns one result dict per record."""
+    scored = score(pd.DataFrame.from_records(records, columns=RAW_INPUT_COLUMNS))
+    return [_result(row) for row in scored.to_dict('records')]
+
+
+def score_each(records: list, score=predict_batch) -> list:
+    """score_records one applicant at a time; a record that fails gets its exception instead of a result."""
+    results = []
+    for record in records:
+        try:
+            results.append(score_records([record], score)[0])
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+class ServiceMetrics:
+    """Counters and a sliding window of request latencies."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.rows = 0
+        self.batches = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+
+    def observe(self, seconds: float, ok: bool = True):
+        self.requests += 1
+        self.errors += not ok
+        self.latencies.append(seconds)
+
+    def snapshot(self) -> dict:
+        uptime = time.perf_counter() - self.started
+        latencies_ms = np.asarray(self.latencies) * 1e3
+        p50, p99 = np.percentile(latencies_ms, [50, 99]) if len(latencies_ms) else (0.0, 0.0)
+        return {
+            'uptime_s': round(uptime, 3),
+            'requests': self.requests,
+            'errors': self.errors,
+            'rows_scored': self.rows,
+            'batches': self.batches,
+            'avg_batch_rows': round(self.rows / self.batches, 2) if self.batches else 0.0,
+            'latency_p50_ms': round(float(p50), 3),
+            'latency_p99_ms': round(float(p99), 3),
+            'requests_per_s': round(self.requests / uptime, 2) if uptime else 0.0,
+            'rows_per_s': round(self.rows / uptime, 2) if uptime else 0.0,
+        }
+
+
+class MicroBatcher:
+    """Queues applicants from concurrent requests and scores them together.
+
+    A batch is flushed when max_batch applicants are waiting or max_wait_ms after its first
+    applicant arrived. Scoring runs in the default executor so the event loop keeps accepting
+    requests meanwhile.
+    """
+
+    def __init__(self, metrics: ServiceMetrics, max_batch: int = 256, max_wait_ms: float = 5.0, score=predict_batch):
+        self.metrics = metrics
+        self.score = score
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1e3
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def submit(self, records: list) -> list:
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in records]
+        for record, future in zip(records, futures):
+            self._queue.put_nowait((record, future))
+        return await asyncio.gather(*futures)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._score(loop, batch)
+
+    async def _score(self, loop, batch):
+        records = [record for record, _ in batch]
+        try:
+            results = await loop.run_in_executor(None, score_records, records, self.score)
+        except Exception:
+            # Do not let one bad applicant fail everyone it was batched with
+            results = await loop.run_in_executor(None, score_each, records, self.score)
+        self.metrics.rows += len(records)
+        self.metrics.batches += 1
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+class ScoringService:
+    def __init__(self, max_batch: int = 256, max_wait_ms: float = 5.0, shadow=None):
+        self.metrics = ServiceMetrics()
+        self.shadow = shadow
+        self.batcher = MicroBatcher(self.metrics, max_batch=max_batch, max_wait_ms=max_wait_ms,
+                                    score=shadow.predict_batch if shadow is not None else predict_batch)
+
+    async def handle(self, method: str, path: str, body: bytes):
+        """Return (status, payload) for one request."""
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok', 'model_loaded': registry.loaded}
+        if method == 'GET' and path == '/metrics':
+            snapshot = self.metrics.snapshot()
+            if self.shadow is not None:
+                snapshot['shadow'] = self.shadow.stats()
+            return 200, snapshot
+        if method == 'POST' and path in ('/score', '/explain'):
+            try:
+                payload = json.loads(body or b'null')
+            except ValueError:
+                raise BadRequest("body must be valid JSON")
+            if path == '/explain':
+                return 200, await self._explain(parse_applicant(payload))
+            if isinstance(payload, list):
+                return 200, await self.batcher.submit([parse_applicant(r) for r in payload])
+            return 200, (await self.batcher.submit([parse_applicant(payload)]))[0]
+        return 404, {'error': f"no route for {method} {path}"}
+
+    async def _explain(self, applicant: dict) -> dict:
+        loop = asyncio.get_running_loop()
+        probability, credit_score, rating, contrib_df = await loop.run_in_executor(
+            None, lambda: explain_from_inputs(*(applicant[col] for col in RAW_INPUT_COLUMNS)))
+        self.metrics.rows += 1
+        return {
+            'default_probability': float(probability),
+            'credit_score': int(credit_score),
+            'rating': rating,
+            'contributions': contrib_df.to_dict('records'),
+        }
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                start = time.perf_counter()
+                method, path, version = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_BYTES:
+                    status, payload = 413, {'error': 'request body too large'}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    # HTTP/1.1 keeps the connection open unless told to close; HTTP/1.0 only when asked
+                    connection = headers.get('connection', '').lower()
+                    if version.strip().upper() == 'HTTP/1.0':
+                        keep_alive = connection == 'keep-alive'
+                    else:
+                        keep_alive = connection != 'close'
+                    try:
+                        status, payload = await self.handle(method, path.split('?', 1)[0], body)
+                    except BadRequest as e:
+                        status, payload = 400, {'error': str(e)}
+                    except Exception as e:
+                        status, payload = 500, {'error': f"scoring failed: {e}"}
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if path.startswith(('/score', '/explain')):
+                    self.metrics.observe(time.perf_counter() - start, ok=status == 200)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _write_response(writer, status: int, payload, keep_alive: bool):
+        body = json.dumps(payload).encode()
+        reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+                  500: 'Internal Server Error'}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8000, max_batch: int = 256, max_wait_ms: float = 5.0,
+                challengers: dict = None, shadow_workers: int = 1):
+    registry.get()  # load the model before accepting traffic
+    shadow = ShadowScorer(challengers, workers=shadow_workers) if challengers else None
+    service = ScoringService(max_batch=max_batch, max_wait_ms=max_wait_ms, shadow=shadow)
+    service.batcher.start()
+    server = await asyncio.start_server(service.serve_connection, host, port)
+    print(f"SafeLend scoring service on http://{host}:{port} (max batch {max_batch}, max wait {max_wait_ms} ms)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.batcher.stop()
+        if shadow is not None:
+            shadow.close(wait=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SafeLend HTTP scoring service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch', type=int, default=256, help="flush a batch at this many applicants")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help="longest a request waits for its batch")
+    parser.add_argument('--challenger', action='append', metavar='NAME=PATH',
+                        help="shadow-score /score batches with this model artifact (repeatable)")
+    parser.add_argument('--shadow-workers', type=int, default=1, help="threads scoring challengers (default: 1)")
+    args = parser.parse_args()
+    try:
+        challengers = parse_challengers(args.challenger)
+    except ValueError as e:
+        parser.error(str(e))
+    if challengers:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch, args.max_wait_ms, challengers, args.shadow_workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""Champion/challenger shadow scoring.
+
+ShadowScorer answers every batch with the champion (prediction_helper.predict_batch on the
+process-wide registry) and hands a copy of the inputs to a background thread pool, where each
+challenger artifact scores them with lite_inference.LiteScorer. Challenger results never reach the
+caller; they are compared with the champion's and aggregated per model, and each comparison is
+logged on the 'safelend.shadow' logger:
+
+    shadow = ShadowScorer({'v2': 'artifacts/model_v2.slm'})
+    scored = shadow.predict_batch(raw_df)      # champion output, same as predict_batch(raw_df)
+    shadow.stats()                             # per-model latency and divergence from the champion
+
+Challenger artifacts may be joblib or compact files (see model_artifact.py) and load lazily on
+their first batch. When max_pending batches are already waiting for the pool, new ones are
+dropped from shadowing (and counted) rather than queued, so a slow challenger cannot hold memory
+or latency on the hot path.
+"""
+import collections
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from lite_inference import LiteScorer
+from prediction_helper import RAW_INPUT_COLUMNS, ModelRegistry, predict_batch, registry
+
+logger = logging.getLogger('safelend.shadow')
+
+LATENCY_WINDOW = 10_000
+
+
+class ModelStats:
+    """Latency window for one model and, for challengers, running divergence from the champion."""
+
+    def __init__(self, fingerprint: str = None):
+        self.fingerprint = fingerprint
+        self.batches = 0
+        self.rows = 0
+        self.errors = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self.sum_abs_probability_diff = 0.0
+        self.max_abs_score_diff = 0
+        self.rating_changes = 0
+
+    def observe(self, seconds: float, rows: int):
+        self.batches += 1
+        self.rows += rows
+        self.latencies.append(seconds)
+
+    def snapshot(self, divergence: bool) -> dict:
+        latencies_ms = np.asarray(self.latencies) * 1e3
+        p50, p99 = np.percentile(latencies_ms, [50, 99]) if len(latencies_ms) else (0.0, 0.0)
+        out = {
+            'fingerprint': self.fingerprint,
+            'batches': self.batches,
+            'rows': self.rows,
+            'errors': self.errors,
+            'latency_p50_ms': round(float(p50), 3),
+            'latency_p99_ms': round(float(p99), 3),
+        }
+        if divergence:
+            out.update({
+                'mean_abs_probability_diff': self.sum_abs_probability_diff / self.rows if self.rows else 0.0,
+                'max_abs_score_diff': self.max_abs_score_diff,
+                'rating_change_rate': self.rating_changes / self.rows if self.rows else 0.0,
+            })
+        return out
+
+
+class ShadowScorer:
+    """predict_batch with the champion, plus asynchronous scoring by named challenger artifacts."""
+
+    def __init__(self, challengers: dict, workers: int = 1, max_pending: int = 8):
+        self.challengers = {name: ModelRegistry(path) for name, path in challengers.items()}
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._champion = ModelStats()
+        self._stats = {name: ModelStats() for name in self.challengers}
+        self._scorers = {}  # name -> (bundle, LiteScorer), rebuilt if the registry reloads
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='shadow')
+
+    def predict_batch(self, raw_df: pd.DataFrame) -> pd.DataFrame:
+        """Champion predict_batch(raw_df); challengers score the same rows in the background."""
+        # Fetched once, so a hot swap during the batch cannot pair these scores with the new fingerprint
+        bundle = registry.get()
+        start = time.perf_counter()
+        scored = predict_batch(raw_df, bundle=bundle)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._champion.fingerprint = bundle.fingerprint
+            self._champion.observe(elapsed, len(scored))
+            if not self.challengers:
+                return scored
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return scored
+            self._pending += 1
+
+        # Copies: the caller owns raw_df and scored and may change them before the pool gets to them
+        columns = {col: raw_df[col].to_numpy(copy=True) for col in RAW_INPUT_COLUMNS if col in raw_df.columns}
+        champion = (scored['default_probability'].to_numpy(copy=True), scored['credit_score'].to_numpy(copy=True),
+                    scored['rating'].to_numpy(dtype=object, copy=True))
+        self._pool.submit(self._shadow, columns, champion)
+        return scored
+
+    def _scorer(self, name: str) -> tuple:
+        bundle = self.challengers[name].get()
+        cached = self._scorers.get(name)
+        if cached is None or cached[0] is not bundle:
+            cached = self._scorers[name] = (bundle, LiteScorer(bundle.model_data))
+        return cached
+
+    def _shadow(self, columns: dict, champion: tuple):
+        try:
+            for name in self.challengers:
+                self._score_challenger(name, columns, champion)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _score_challenger(self, name: str, columns: dict, champion: tuple):
+        stats = self._stats[name]
+        try:
+            start = time.perf_counter()
+            bundle, scorer = self._scorer(name)
+            out = scorer.predict_batch(columns)
+            elapsed = time.perf_counter() - start
+        except Exception:
+            with self._lock:
+                stats.errors += 1
+            logger.exception("challenger %s failed to score a batch", name)
+            return
+
+        probability_diff = np.abs(out['default_probability'] - champion[0])
+        score_diff = np.abs(out['credit_score'].astype(np.int64) - champion[1].astype(np.int64))
+        rating_changes = int(np.count_nonzero(out['rating'] != champion[2]))
+        rows = len(probability_diff)
+        with self._lock:
+            stats.fingerprint = bundle.fingerprint
+            stats.observe(elapsed, rows)
+            stats.sum_abs_probability_diff += float(probability_diff.sum())
+            stats.max_abs_score_diff = max(stats.max_abs_score_diff, int(score_diff.max(initial=0)))
+            stats.rating_changes += rating_changes
+        logger.info("shadow %s: %d rows in %.2f ms, mean |dp| %.5f, max |dscore| %d, %d rating changes",
+                    name, rows, elapsed * 1e3, probability_diff.mean() if rows else 0.0,
+                    score_diff.max(initial=0), rating_changes)
+
+    def stats(self) -> dict:
+        """Per-model latency, and for each challenger its divergence from the champion."""
+        with self._lock:
+            return {
+                'champion': self._champion.snapshot(divergence=False),
+                'challengers': {name: s.snapshot(divergence=True) for name, s in self._stats.items()},
+                'pending': self._pending,
+                'dropped': self.dropped,
+            }
+
+    def close(self, wait: bool = True):
+        """Stop the background pool; with wait, finish the batches already handed to it."""
+        self._pool.shutdown(wait=wait)
+
+
+def parse_challengers(specs) -> dict:
+    """{'name': path} from NAME=PATH strings (a bare PATH is named after its position)."""
+    challengers = {}
+    for i, spec in enumerate(specs or []):
+        name, sep, path = spec.partition('=')
+        if not sep:
+            name, path = f'challenger_{i + 1}', spec
+        if not name or not path:
+            raise ValueError(f"challenger must be NAME=PATH, got {spec!r}")
+        challengers[name] = path
+    return challengers
@@ -0,0 +1,134 @@
+"""Vectorized validation and normalization of raw applicant inputs, with per-row rejects.
+
+validate_inputs checks whole columns at once against the same rules as the app's input form:
+
+    numbers      finite; age, loan_tenure_months and num_open_accounts whole numbers
+    ranges       age 18-100, delinquency and credit utilization ratios 0-100, open accounts 1-10,
+                 income, loan amount, tenure and average DPD not negative
+    categories   residence_type, loan_purpose and loan_type within CATEGORY_DOMAINS; matching
+                 ignores case and surrounding spaces, and values are rewritten to the canonical
+                 spelling ('  owned' -> 'Owned')
+
+Valid rows come back ready for predict_batch, with the categories as pandas Categoricals. Invalid
+rows come back with their row number and every reason they failed. Messages are only built for
+the rows that fail, so a clean batch costs a few array comparisons per column. RejectLog applies
+this to a stream of chunks and appends the rejects to a CSV:
+
+    rejects = RejectLog('rejects.csv')
+    score_file('applicants.csv', 'scored.parquet', rejects=rejects)   # rejects.rows, rejects.rejected
+"""
+import numpy as np
+import pandas as pd
+
+from encoding import distinct_codes
+from prediction_helper import CATEGORICAL_INPUT_COLUMNS, CATEGORY_DOMAINS, INT_INPUT_COLUMNS, RAW_INPUT_COLUMNS
+
+# Allowed (lowest, highest) value of each numeric input, as in the input form
+NUMERIC_RANGES = {
+    'age': (18, 100),
+    'income': (0, np.inf),
+    'loan_amount': (0, np.inf),
+    'loan_tenure_months': (0, np.inf),
+    'avg_dpd_per_delinquency': (0, np.inf),
+    'delinquency_ratio': (0, 100),
+    'credit_utilization_ratio': (0, 100),
+    'num_open_accounts': (1, 10),
+}
+REJECT_COLUMNS = ['row', 'reasons'] + RAW_INPUT_COLUMNS
+
+
+def _describe_range(lo, hi) -> str:
+    if hi == np.inf:
+        return f"below {lo:g}"
+    return f"outside {lo:g}-{hi:g}"
+
+
+def validate_inputs(raw_df: pd.DataFrame, first_row: int = 0) -> tuple:
+    """Split raw_df into (valid, rejects).
+
+    valid holds the normalized inputs of the rows that pass every check (fresh RangeIndex): numbers
+    as float64 and categories as Categoricals over CATEGORY_DOMAINS.
+    rejects holds REJECT_COLUMNS for the others: 'row' is the position in raw_df plus first_row,
+    'reasons' lists every failed check, and the raw input values follow as given.
+    Raises ValueError if a whole input column is missing.
+    """
+    missing = [col for col in RAW_INPUT_COLUMNS if col not in raw_df.columns]
+    if missing:
+        raise ValueError(f"missing input columns: {', '.join(missing)}")
+
+    n = len(raw_df)
+    columns = {}
+    checks = []  # (column, boolean mask of failing rows, message for one failing value)
+    for col, (lo, hi) in NUMERIC_RANGES.items():
+        values = pd.to_numeric(raw_df[col], errors='coerce').to_numpy(dtype=np.float64)
+        finite = np.isfinite(values)
+        checks.append((col, ~finite, lambda v: "missing" if pd.isna(v) else f"{v!r} is not a number"))
+        if col in INT_INPUT_COLUMNS:
+            checks.append((col, finite & (values != np.trunc(values)), lambda v: f"{v} is not a whole number"))
+        checks.append((col, finite & ((values < lo) | (values > hi)),
+                       lambda v, lo=lo, hi=hi: f"{v} {_describe_range(lo, hi)}"))
+        columns[col] = values
+
+    for col in CATEGORICAL_INPUT_COLUMNS:
+        domain = CATEGORY_DOMAINS[col]
+        positions = {value.casefold(): i for i, value in enumerate(domain)}
+        # One lookup per distinct value into the domain
+        domain_codes = distinct_codes(raw_df[col], lambda value: positions.get(str(value).strip().casefold(), -1),
+                                      dtype=np.int8)
+        checks.append((col, domain_codes < 0, lambda v, domain=domain: (
+            "missing" if pd.isna(v) else f"{v!r} is not one of {', '.join(domain)}")))
+        columns[col] = domain_codes
+
+    failed = np.zeros(n, dtype=bool)
+    for _, mask, _ in checks:
+        failed |= mask
+    keep = ~failed if failed.any() else slice(None)
+    valid = pd.DataFrame({col: pd.Categorical.from_codes(columns[col][keep], categories=CATEGORY_DOMAINS[col])
+                          if col in CATEGORY_DOMAINS else columns[col][keep] for col in RAW_INPUT_COLUMNS})
+    if not failed.any():
+        return valid, pd.DataFrame(columns=REJECT_COLUMNS)
+
+    bad_rows = np.flatnonzero(failed)
+    reasons = {i: [] for i in bad_rows}
+    for col, mask, message in checks:
+        raw = raw_df[col]
+        for i in np.flatnonzero(mask):
+            reasons[i].append(f"{col}: {message(raw.iat[i])}")
+    rejects = raw_df.iloc[bad_rows][RAW_INPUT_COLUMNS].reset_index(drop=True)
+    rejects.insert(0, 'reasons', ['; '.join(reasons[i]) for i in bad_rows])
+    rejects.insert(0, 'row', bad_rows + first_row)
+    return valid, rejects
+
+
+class RejectLog:
+    """Validates chunks on their way to the scorer and appends the rejected rows to a CSV.
+
+    destination is a path or a writable text file object. Row numbers count data rows across all
+    chunks from 0 (the header is not a row).
+    """
+
+    def __init__(self, destination):
+        self.destination = destination
+        self.rows = 0
+        self.rejected = 0
+        self._header_written = False
+
+    def write(self, rejects: pd.DataFrame):
+        if hasattr(self.destination, 'write'):
+            rejects.to_csv(self.destination, header=not self._header_written, index=False)
+        else:
+            with open(self.destination, 'a' if self._header_written else 'w', newline='') as out:
+                rejects.to_csv(out, header=not self._header_written, index=False)
+        self._header_written = True
+
+    def filter(self, chunks):
+        """Yield the valid part of each chunk of raw inputs, writing the rest to the reject file."""
+        if not self._header_written:
+            self.write(pd.DataFrame(columns=REJECT_COLUMNS))  # an empty reject file still has its header
+        for chunk in chunks:
+            valid, rejects = validate_inputs(chunk, first_row=self.rows)
+            self.rows += len(chunk)
+            if len(rejects):
+                self.rejected += len(rejects)
+                self.write(rejects)
+            yield valid